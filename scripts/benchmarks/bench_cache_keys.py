@@ -0,0 +1,104 @@
+"""Benchmark search cache keys: cost per key and hit ratio on a replayed query log.
+
+The log draws popular searches from a Zipf-like distribution and writes each one the way
+real clients do: mixed case, stray whitespace and punctuation, accents, and date windows
+in different timezone offsets. An unbounded cache replays it with each key builder.
+
+Usage: python scripts/benchmarks/bench_cache_keys.py [--requests 50000] [--distinct 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import time
+from dataclasses import asdict
+from datetime import timedelta, timezone
+from typing import Callable, List
+
+from catalog import CATALOG_START, CITIES, LEAGUES, SUFFIXES
+
+from app.schemas import SearchFilters, SearchRequest
+from app.services import SearchService
+from common.matching import SearchTerms
+
+ACCENTED = {"e": "é", "a": "á", "o": "ö", "u": "ü", "i": "í"}
+OFFSETS = [timezone.utc, timezone(timedelta(hours=2)), timezone(timedelta(hours=-5)), timezone(timedelta(hours=9))]
+
+
+def raw_request_key(request: SearchRequest) -> str:
+    """The original key: the whole request dumped to JSON and hashed."""
+    serialized = json.dumps(request.model_dump(mode="json"), sort_keys=True)
+    return f"search:{hashlib.sha1(serialized.encode('utf-8')).hexdigest()}"
+
+
+def terms_json_key(request: SearchRequest) -> str:
+    """Normalized terms dumped to JSON and hashed."""
+    serialized = json.dumps(
+        {"terms": asdict(SearchTerms.from_request(request)), "limit": request.limit}, sort_keys=True, default=str
+    )
+    return f"search:{hashlib.sha1(serialized.encode('utf-8')).hexdigest()}"
+
+
+def vary(text: str, rng: random.Random) -> str:
+    choice = rng.randrange(5)
+    if choice == 0:
+        return text.upper()
+    if choice == 1:
+        return f"  {text.lower()} "
+    if choice == 2:
+        return "".join(ACCENTED.get(char, char) if rng.random() < 0.3 else char for char in text)
+    if choice == 3:
+        return text.replace(" ", " - ") + "!"
+    return text
+
+
+def make_log(requests: int, distinct: int, seed: int = 11) -> List[SearchRequest]:
+    rng = random.Random(seed)
+    searches = []
+    for _ in range(distinct):
+        query = f"{rng.choice(CITIES)} {rng.choice(SUFFIXES)}" if rng.random() < 0.7 else None
+        league = rng.choice(LEAGUES) if query is None or rng.random() < 0.2 else None
+        start = CATALOG_START + timedelta(days=rng.randrange(0, 330)) if rng.random() < 0.4 else None
+        searches.append((query, league, start))
+    weights = [1.0 / (rank + 1) for rank in range(distinct)]
+
+    log: List[SearchRequest] = []
+    for query, league, start in rng.choices(searches, weights=weights, k=requests):
+        filters = SearchFilters(league=vary(league, rng) if league else None)
+        if start is not None:
+            offset = rng.choice(OFFSETS)
+            filters.date_from = start.astimezone(offset)
+            filters.date_to = (start + timedelta(days=7)).astimezone(offset)
+        log.append(SearchRequest(query=vary(query, rng) if query else None, filters=filters))
+    return log
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--distinct", type=int, default=2_000)
+    args = parser.parse_args()
+
+    log = make_log(args.requests, args.distinct)
+    builders: List[tuple[str, Callable[[SearchRequest], str]]] = [
+        ("raw request JSON + sha1", raw_request_key),
+        ("terms JSON + sha1", terms_json_key),
+        ("canonical terms + blake2b", SearchService._cache_key),
+    ]
+    print(f"{len(log):,} requests over {args.distinct:,} distinct searches")
+    for label, build in builders:
+        started = time.perf_counter()
+        keys = [build(request) for request in log]
+        per_key_us = (time.perf_counter() - started) * 1e6 / len(log)
+        seen = set()
+        hits = 0
+        for key in keys:
+            hits += key in seen
+            seen.add(key)
+        print(f"  {label:<27} {per_key_us:7.2f} us/key  {len(seen):7,} keys  hit ratio {hits / len(log):6.1%}")
+
+
+if __name__ == "__main__":
+    main()
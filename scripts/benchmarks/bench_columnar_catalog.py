@@ -0,0 +1,61 @@
+"""Benchmark catalog memory and search latency: indexed Event models vs NumPy columns.
+
+Memory is the Python heap retained by each catalog as measured by tracemalloc (NumPy
+registers its buffers with it).
+
+Usage: python scripts/benchmarks/bench_columnar_catalog.py [--events 1000000] [--repeat 10]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Tuple, TypeVar
+
+from bench_inmemory_search import QUERIES, per_call_ms
+from catalog import make_catalog
+
+from app.repositories import InMemoryProviderRepository
+from app.repositories_columnar import ColumnarProviderRepository
+
+T = TypeVar("T")
+
+
+def retained(build: Callable[[], T]) -> Tuple[T, float, float]:
+    """Return the built object, MiB it keeps alive and build seconds."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    return value, (tracemalloc.get_traced_memory()[0] - before) / 2**20, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    events, events_mib, _ = retained(lambda: make_catalog(args.events))
+    indexed, index_mib, index_s = retained(lambda: InMemoryProviderRepository(events=events))
+    columnar, columnar_mib, columnar_s = retained(lambda: ColumnarProviderRepository(events))
+    tracemalloc.stop()
+
+    print(f"{args.events:,} events")
+    print(f"  indexed:  {events_mib + index_mib:8.1f} MiB  (Event models {events_mib:.1f} + indexes {index_mib:.1f}), build {index_s:.1f}s")
+    print(f"  columnar: {columnar_mib:8.1f} MiB  build {columnar_s:.1f}s")
+    print(f"  {'search':<22} {'indexed ms':>11} {'columnar ms':>12}")
+
+    for label, request in QUERIES:
+        assert [e.event_id for e in indexed.find(request)] == [e.event_id for e in columnar.find(request)]
+        indexed_ms = per_call_ms(lambda: indexed.find(request), args.repeat)
+        columnar_ms = per_call_ms(lambda: columnar.find(request), args.repeat)
+        print(f"  {label:<22} {indexed_ms:>11.3f} {columnar_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
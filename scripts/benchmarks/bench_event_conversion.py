@@ -0,0 +1,109 @@
+"""Benchmark provider payload -> Event conversion (per-object vs batched).
+
+Usage: python scripts/benchmarks/bench_event_conversion.py [--sizes 10000 100000] [--listings 3]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.append(str(SERVICE_ROOT))
+
+from app.repositories import HttpProviderConfig, HttpProviderRepository, _iterate  # noqa: E402
+from app.schemas import Currency, Event, Price, SearchRequest, SeatDetails, TicketListing  # noqa: E402
+from common.serialization import events_to_documents, validate_events  # noqa: E402
+
+
+def make_payloads(count: int, listings: int) -> List[Dict[str, object]]:
+    return [
+        {
+            "event_id": f"evt-{idx}",
+            "title": f"Team {idx % 500} vs Team {(idx + 1) % 500}",
+            "league": "Bench League",
+            "venue": f"Stadium {idx % 200}",
+            "start_at": "2025-05-01T18:00:00+00:00",
+            "teams": [f"Team {idx % 500}", f"Team {(idx + 1) % 500}"],
+            "listings": [
+                {
+                    "listing_id": f"list-{idx}-{offset}",
+                    "url": f"https://tickets.example.com/{idx}/{offset}",
+                    "price": 40 + offset,
+                    "currency": "EUR",
+                    "section": "A",
+                    "row": str(offset),
+                }
+                for offset in range(listings)
+            ],
+        }
+        for idx in range(count)
+    ]
+
+
+def legacy_to_event(provider_id: str, payload: Dict[str, object]) -> Event:
+    """Per-object conversion as implemented before batching."""
+    listings = [
+        TicketListing(
+            listing_id=str(item.get("listing_id")),
+            provider=provider_id,
+            url=str(item.get("url")),
+            price=Price(amount=float(item.get("price", 0)), currency=Currency(item.get("currency", "USD"))),
+            seat=SeatDetails(section=item.get("section"), row=item.get("row"), seat=item.get("seat")),
+            is_best_price=bool(item.get("is_best_price", False)),
+            fetched_at=datetime.now(timezone.utc),
+        )
+        for item in payload.get("listings", [])
+    ]
+    return Event(
+        event_id=str(payload.get("event_id")),
+        title=str(payload.get("title")),
+        league=payload.get("league"),
+        venue=payload.get("venue"),
+        start_at=datetime.fromisoformat(str(payload.get("start_at"))),
+        teams=list(payload.get("teams", [])),
+        listings=listings,
+    )
+
+
+def timed(label: str, count: int, func) -> None:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<34} {elapsed:8.3f}s  {count / elapsed:>12,.0f} events/sec")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--listings", type=int, default=3)
+    args = parser.parse_args()
+
+    repo = HttpProviderRepository(config=HttpProviderConfig(provider_id="bench", base_url="https://bench.test"))
+    request = SearchRequest(query="Team", limit=100)
+
+    for size in args.sizes:
+        payloads = make_payloads(size, args.listings)
+        print(f"{size:,} events x {args.listings} listings")
+
+        timed("provider: per-object _to_event", size, lambda: [legacy_to_event("bench", item) for item in payloads])
+        timed(
+            "provider: batched _collect_events",
+            size,
+            lambda: asyncio.run(repo._collect_events(_iterate(payloads), request, limit=size)),
+        )
+
+        fetched_at = datetime.now(timezone.utc)
+        documents = events_to_documents(validate_events([repo._to_event_payload(p, fetched_at) for p in payloads]))
+        timed("cache read: Event(**item)", size, lambda: [Event(**item) for item in documents])
+        timed("cache read: validate_events", size, lambda: validate_events(documents))
+
+
+if __name__ == "__main__":
+    main()
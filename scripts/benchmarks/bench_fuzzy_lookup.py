@@ -0,0 +1,67 @@
+"""Benchmark TrigramIndex.closest latency over a vocabulary of distinct name tokens.
+
+Usage: python scripts/benchmarks/bench_fuzzy_lookup.py [--names 50000] [--lookups 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from catalog import SERVICE_ROOT  # noqa: F401  (puts the service on sys.path)
+
+from common.search_index import TrigramIndex
+
+ONSETS = ["b", "c", "d", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "w", "br", "ch", "st", "tr"]
+VOWELS = ["a", "e", "i", "o", "u", "ea", "ou"]
+CODAS = ["", "", "n", "r", "s", "l", "rd", "ng", "ck"]
+# Name-like words: onset + vowel + coda syllables, e.g. "chelsea", "bourton", "streamford".
+SYLLABLES = [onset + vowel + coda for onset in ONSETS for vowel in VOWELS for coda in CODAS]
+
+
+def make_names(count: int, rng: random.Random) -> list[str]:
+    names: set[str] = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(names)
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    idx = rng.randrange(len(word))
+    edit = rng.choice(["drop", "double", "swap"])
+    if edit == "drop":
+        return word[:idx] + word[idx + 1 :]
+    if edit == "double":
+        return word[:idx] + word[idx] + word[idx:]
+    return word[:idx] + rng.choice(string.ascii_lowercase) + word[idx + 1 :]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    names = make_names(args.names, rng)
+    started = time.perf_counter()
+    index = TrigramIndex()
+    index.add(names)
+    print(f"{len(index):,} distinct tokens, build {time.perf_counter() - started:.2f}s")
+
+    queries = [misspell(rng.choice(names), rng) for _ in range(args.lookups)]
+    timings = []
+    resolved = 0
+    for query in queries:
+        started = time.perf_counter()
+        resolved += index.closest(query, args.threshold) is not None
+        timings.append((time.perf_counter() - started) * 1000.0)
+    timings.sort()
+    print(f"  resolved {resolved / len(queries):.0%} of {len(queries):,} misspellings")
+    print("  " + "  ".join(f"p{q} {timings[int(len(timings) * q / 100)]:.3f} ms" for q in (50, 90, 95, 99)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark InMemoryProviderRepository search: legacy linear scan vs substring/start-time indexes.
+
+Usage: python scripts/benchmarks/bench_inmemory_search.py [--events 100000] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import timedelta
+from typing import Callable, List
+
+from catalog import CATALOG_START, make_catalog
+
+from app.repositories import InMemoryProviderRepository
+from app.schemas import Event, SearchFilters, SearchRequest
+from common.matching import event_matches
+
+QUERIES = [
+    ("query 'Madrid'", SearchRequest(query="Madrid")),
+    ("query 'Club 42'", SearchRequest(query="Club 42")),
+    ("query 'drid' (mid-word)", SearchRequest(query="drid")),
+    ("query miss 'Valhalla'", SearchRequest(query="Valhalla")),
+    ("team + league", SearchRequest(filters=SearchFilters(team="London City", league="Premier League"))),
+    ("league + location", SearchRequest(filters=SearchFilters(league="NBA", location="Chicago"))),
+    (
+        "this weekend",
+        SearchRequest(
+            filters=SearchFilters(
+                date_from=CATALOG_START + timedelta(days=200), date_to=CATALOG_START + timedelta(days=202)
+            )
+        ),
+    ),
+    (
+        "next 60 days + team",
+        SearchRequest(
+            filters=SearchFilters(
+                team="Milan", date_from=CATALOG_START + timedelta(days=300), date_to=CATALOG_START + timedelta(days=360)
+            )
+        ),
+    ),
+    (
+        "weekend + league",
+        SearchRequest(
+            filters=SearchFilters(
+                league="NHL", date_from=CATALOG_START + timedelta(days=100), date_to=CATALOG_START + timedelta(days=102)
+            )
+        ),
+    ),
+]
+
+
+def linear_scan(events: List[Event], request: SearchRequest) -> List[Event]:
+    """The pre-index search loop: check every event in turn."""
+    matched: List[Event] = []
+    for event in events:
+        if event_matches(event, request):
+            matched.append(event)
+            if len(matched) >= request.limit:
+                break
+    return matched
+
+
+def per_call_ms(func: Callable[[], object], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) * 1000.0 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    events = make_catalog(args.events)
+    started = time.perf_counter()
+    repo = InMemoryProviderRepository(events=events)
+    print(f"{args.events:,} events, index build {time.perf_counter() - started:.2f}s")
+    print(f"  {'search':<24} {'scan ms':>10} {'index ms':>10} {'speedup':>9}")
+
+    for label, request in QUERIES:
+        # Result order differs (the index walks start time), so only check both agree on the hit count.
+        assert len(linear_scan(events, request)) == len(repo.find(request))
+        scan_ms = per_call_ms(lambda: linear_scan(events, request), args.repeat)
+        index_ms = per_call_ms(lambda: repo.find(request), args.repeat)
+        print(f"  {label:<24} {scan_ms:>10.2f} {index_ms:>10.3f} {scan_ms / index_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark fan-out result merging: dedupe + full sort vs k-way heap merge stopping at limit.
+
+Usage: python scripts/benchmarks/bench_merge_events.py [--providers 8] [--per-provider 10000] [--limit 25]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from catalog import make_catalog
+
+from common.normalization import merge_events, normalize_events, sort_events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--providers", type=int, default=8)
+    parser.add_argument("--per-provider", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.providers * args.per_provider)
+    # Overlapping slices so providers share some events, each returned in start-time order.
+    step = args.per_provider * 9 // 10
+    streams = [sort_events(catalog[idx * step : idx * step + args.per_provider]) for idx in range(args.providers)]
+    flat = [event for stream in streams for event in stream]
+    assert normalize_events(flat)[: args.limit] == merge_events(streams, args.limit)
+
+    for label, func in (
+        ("dedupe + sort all", lambda: normalize_events(flat)[: args.limit]),
+        ("k-way merge to limit", lambda: merge_events(streams, args.limit)),
+    ):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            func()
+        elapsed_ms = (time.perf_counter() - started) * 1000.0 / args.repeat
+        print(f"  {label:<22} {elapsed_ms:9.3f} ms  ({len(flat):,} events from {args.providers} providers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark Mongo search cache layouts: nested event documents vs compressed JSON blobs.
+
+Without a live server, a read is modelled as BSON decoding (what the driver does with the
+wire bytes) plus conversion back to events; the stored size is the BSON document size,
+which is what Cosmos bills RU and bandwidth on.
+
+Usage: python scripts/benchmarks/bench_mongo_cache_format.py [--sizes 10 25 100] [--repeat 200]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict
+
+import bson
+
+from catalog import make_catalog
+
+from app.repositories_mongo import MongoSearchCacheRepository
+from common.serialization import encode_search_response
+
+
+class CapturingCollection:
+    """Keeps the BSON bytes of the last written document, as the server would receive them."""
+
+    def __init__(self) -> None:
+        self.raw: Dict[str, bytes] = {}
+
+    async def replace_one(self, query, document, upsert=False):
+        self.raw[query["_id"]] = bson.encode(document)
+
+    async def find_one(self, query, projection=None):
+        return bson.decode(self.raw[query["_id"]])
+
+
+async def per_call_ms(func: Callable[[], Awaitable[object]], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await func()
+    return (time.perf_counter() - started) * 1000.0 / repeat
+
+
+async def run(sizes, repeat: int) -> None:
+    catalog = make_catalog(max(sizes))
+    print(f"{'events':>6}  {'layout':<12} {'stored':>10} {'write ms':>9} {'read ms':>9}")
+    for size in sizes:
+        events = catalog[:size]
+        # SearchService hands the cache the response body it already encoded.
+        body = encode_search_response(events)
+        for label, compressed in (("documents", False), ("compressed", True)):
+            collection = CapturingCollection()
+            repo = MongoSearchCacheRepository(collection=collection, ttl_seconds=600, compressed=compressed)
+            write_ms = await per_call_ms(lambda: repo.set("search:key", events, body=body, limit=size), repeat)
+            cached = await repo.lookup("search:key")
+            assert cached is not None and cached.events == events
+            read_ms = await per_call_ms(lambda: repo.lookup("search:key"), repeat)
+            stored = len(collection.raw["search:key"])
+            print(f"{size:>6}  {label:<12} {stored:>8,} B {write_ms:>9.3f} {read_ms:>9.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 100])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark concurrent searches: in-loop indexed catalog vs the process-sharded catalog.
+
+Reports queries/sec for a burst of concurrent searches and the worst event-loop stall seen
+by a 1 ms ticker meanwhile (how long other requests on the worker would have waited).
+
+Usage: python scripts/benchmarks/bench_sharded_search.py [--events 200000] [--shards 4] [--burst 200]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from bench_inmemory_search import QUERIES
+from catalog import make_catalog
+
+from app.repositories import InMemoryProviderRepository
+from app.repositories_sharded import ShardedProviderRepository
+from app.schemas import Event, SearchRequest
+
+
+async def run_burst(search: Callable[[SearchRequest], Awaitable[List[Event]]], burst: int) -> None:
+    stalls: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append(time.perf_counter() - started - 0.001)
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await asyncio.gather(*(search(QUERIES[idx % len(QUERIES)][1]) for idx in range(burst)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticking
+    print(f"    {burst / elapsed:8.0f} queries/s   worst loop stall {max(stalls) * 1000.0:8.1f} ms")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    events = make_catalog(args.events)
+    indexed = InMemoryProviderRepository(events=events)
+    print(f"{args.events:,} events, burst of {args.burst} concurrent searches")
+    print("  indexed, in the event loop")
+    await run_burst(indexed.search, args.burst)
+
+    sharded = ShardedProviderRepository(events, shards=args.shards)
+    try:
+        await sharded.search(QUERIES[0][1])  # start the shard processes and build their indexes
+        print(f"  sharded across {args.shards} processes")
+        await run_burst(sharded.search, args.burst)
+    finally:
+        await sharded.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--burst", type=int, default=200)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
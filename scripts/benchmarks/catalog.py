@@ -0,0 +1,51 @@
+"""Synthetic event catalog shared by the search benchmarks."""
+from __future__ import annotations
+
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.append(str(SERVICE_ROOT))
+
+from app.schemas import Event  # noqa: E402
+from common.serialization import validate_events  # noqa: E402
+
+LEAGUES = ["La Liga", "Premier League", "Serie A", "Bundesliga", "Ligue 1", "NBA", "MLB", "NHL", "NFL", "MLS"]
+CITIES = ["Madrid", "Barcelona", "London", "Manchester", "Milan", "Munich", "Paris", "New York", "Boston", "Chicago"]
+SUFFIXES = ["United", "City", "Rovers", "Athletic", "Wanderers", "Rangers", "Stars", "Giants", "Kings", "FC"]
+CATALOG_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def make_catalog(count: int, seed: int = 7) -> List[Event]:
+    rng = random.Random(seed)
+    teams = [f"{city} {suffix}" for city in CITIES for suffix in SUFFIXES] + [f"Club {idx}" for idx in range(400)]
+    payloads: List[Dict[str, object]] = []
+    for idx in range(count):
+        home, away = rng.sample(teams, 2)
+        city = home.split(" ")[0] if not home.startswith("Club") else rng.choice(CITIES)
+        start_at = CATALOG_START + timedelta(minutes=rng.randrange(0, 365 * 24 * 60))
+        payloads.append(
+            {
+                "event_id": f"evt-{idx}",
+                "title": f"{home} vs {away}",
+                "league": rng.choice(LEAGUES),
+                "venue": f"Stadium {idx % 900}, {city}",
+                "start_at": start_at,
+                "teams": [home, away],
+                "listings": [
+                    {
+                        "listing_id": f"list-{idx}",
+                        "provider": "bench",
+                        "url": f"https://tickets.example.com/{idx}",
+                        "price": {"amount": rng.randint(20, 400), "currency": rng.choice(["USD", "EUR", "GBP"])},
+                        "fetched_at": CATALOG_START,
+                    }
+                ],
+            }
+        )
+    return validate_events(payloads)
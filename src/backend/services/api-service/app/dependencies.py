@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
+import logging
 import os
 
 from common.config import AppSettings, get_settings
@@ -12,14 +13,19 @@ from app.repositories import (
     InMemoryProviderRepository,
     InMemorySearchCache,
     InMemoryUserProfileRepository,
-    ProviderRepository,
+    LayeredSearchCache,
     SearchCacheRepository,
     UserProfileRepository,
+    sample_events,
 )
+from app.repositories_columnar import ColumnarProviderRepository
 from app.repositories_mongo import MongoSearchCacheRepository, MongoUserProfileRepository
-from app.services import ProfileService, SearchService, TicketFinderService
+from app.repositories_sharded import ShardedProviderRepository
+from app.services import CacheWarmer, ProfileService, SearchService, TicketFinderService
 from openai import OpenAI
 
+logger = logging.getLogger(__name__)
+
 
 @lru_cache
 def get_app_settings() -> AppSettings:
@@ -27,12 +33,29 @@ def get_app_settings() -> AppSettings:
 
 
 @lru_cache
-def get_provider_repository() -> ProviderRepository:
+def get_provider_repository() -> CompositeProviderRepository:
     settings = get_app_settings()
     providers = []
 
-    if settings.enable_stub_data:
-        providers.append(InMemoryProviderRepository())
+    if settings.enable_stub_data and settings.stub_catalog_backend == "columnar":
+        providers.append(
+            ColumnarProviderRepository(
+                sample_events("sample-tickets"),
+                provider_id="sample-tickets",
+                fuzzy_threshold=settings.stub_catalog_fuzzy_threshold,
+            )
+        )
+    elif settings.enable_stub_data and settings.stub_catalog_backend == "sharded":
+        providers.append(
+            ShardedProviderRepository(
+                sample_events("sample-tickets"),
+                shards=settings.stub_catalog_shards,
+                provider_id="sample-tickets",
+                fuzzy_threshold=settings.stub_catalog_fuzzy_threshold,
+            )
+        )
+    elif settings.enable_stub_data:
+        providers.append(InMemoryProviderRepository(fuzzy_threshold=settings.stub_catalog_fuzzy_threshold))
 
     if settings.enable_stub_http_provider and settings.stub_provider_base_url:
         providers.append(
@@ -40,20 +63,68 @@ def get_provider_repository() -> ProviderRepository:
                 config=HttpProviderConfig(
                     provider_id="stub-http",
                     base_url=str(settings.stub_provider_base_url),
+                    max_connections=settings.provider_max_connections,
+                    max_keepalive_connections=settings.provider_max_keepalive_connections,
+                    keepalive_expiry_seconds=settings.provider_keepalive_expiry_seconds,
+                    http2=settings.provider_http2,
+                    max_retries=settings.provider_max_retries,
+                    retry_backoff_base_seconds=settings.provider_retry_backoff_base_seconds,
+                    retry_backoff_max_seconds=settings.provider_retry_backoff_max_seconds,
+                    circuit_failure_threshold=settings.provider_circuit_failure_threshold,
+                    circuit_reset_timeout_seconds=settings.provider_circuit_reset_timeout_seconds,
+                    hedge_enabled=settings.provider_hedge_enabled,
+                    hedge_percentile=settings.provider_hedge_percentile,
+                    hedge_budget_ratio=settings.provider_hedge_budget_ratio,
+                    stream_events=settings.provider_stream_events,
+                    max_pages=settings.provider_max_pages,
+                    rate_limit_per_second=settings.provider_rate_limit_per_second,
+                    rate_limit_burst=settings.provider_rate_limit_burst,
+                    rate_limit_max_queue=settings.provider_rate_limit_max_queue,
+                    rate_limit_max_wait_seconds=settings.provider_rate_limit_max_wait_seconds,
                 )
             )
         )
 
-    return CompositeProviderRepository(providers=providers)
+    return CompositeProviderRepository(
+        providers=providers,
+        search_timeout_seconds=settings.provider_search_timeout_seconds,
+        provider_timeout_seconds=settings.provider_timeout_seconds,
+    )
 
 
 @lru_cache
 def get_cache_repository() -> SearchCacheRepository:
     settings = get_app_settings()
     if settings.use_mongo_cache and settings.mongodb_uri:
-        collection = get_database(settings)["search_cache"]
-        return MongoSearchCacheRepository(collection=collection, ttl_seconds=settings.search_cache_ttl_seconds)
-    return InMemorySearchCache(ttl_seconds=settings.search_cache_ttl_seconds)
+        database = get_database(settings)
+        shared = MongoSearchCacheRepository(
+            collection=database["search_cache"],
+            ttl_seconds=settings.search_cache_ttl_seconds,
+            stale_while_revalidate_seconds=settings.search_cache_stale_while_revalidate_seconds,
+            stale_if_error_seconds=settings.search_cache_stale_if_error_seconds,
+            compressed=settings.search_cache_mongo_compressed,
+            popularity_collection=database["search_popularity"],
+            popularity_window_seconds=settings.search_popularity_window_seconds,
+        )
+        if not settings.search_cache_l1_ttl_seconds:
+            return shared
+        local = InMemorySearchCache(
+            ttl_seconds=min(settings.search_cache_l1_ttl_seconds, settings.search_cache_ttl_seconds),
+            max_entries=settings.search_cache_l1_max_entries,
+            max_bytes=settings.search_cache_max_bytes or None,
+            sweep_interval_seconds=settings.search_cache_sweep_interval_seconds,
+            stale_while_revalidate_seconds=settings.search_cache_stale_while_revalidate_seconds,
+            stale_if_error_seconds=settings.search_cache_stale_if_error_seconds,
+        )
+        return LayeredSearchCache(l1=local, l2=shared)
+    return InMemorySearchCache(
+        ttl_seconds=settings.search_cache_ttl_seconds,
+        stale_while_revalidate_seconds=settings.search_cache_stale_while_revalidate_seconds,
+        stale_if_error_seconds=settings.search_cache_stale_if_error_seconds,
+        max_entries=settings.search_cache_max_entries,
+        max_bytes=settings.search_cache_max_bytes or None,
+        sweep_interval_seconds=settings.search_cache_sweep_interval_seconds,
+    )
 
 
 @lru_cache
@@ -64,6 +135,20 @@ def get_search_service() -> SearchService:
     )
 
 
+@lru_cache
+def get_cache_warmer() -> CacheWarmer:
+    settings = get_app_settings()
+    return CacheWarmer(
+        search_service=get_search_service(),
+        favorites_repository=get_user_profile_repository(),
+        top_queries=settings.search_warmup_top_queries,
+        top_favorites=settings.search_warmup_top_favorites,
+        concurrency=settings.search_warmup_concurrency,
+        timeout_seconds=settings.search_warmup_timeout_seconds,
+        refresh_within_seconds=settings.search_warmup_refresh_within_seconds,
+    )
+
+
 @lru_cache
 def get_user_profile_repository() -> UserProfileRepository:
     settings = get_app_settings()
@@ -90,3 +175,23 @@ def get_ticket_finder_service() -> TicketFinderService:
         model=settings.openai_model,
         use_websearch=settings.openai_use_websearch,
     )
+
+
+async def startup_resources() -> None:
+    """Prepare providers and storage once at startup (e.g. catalog shards, cache TTL indexes)."""
+    await get_provider_repository().start()
+    ensure_indexes = getattr(get_cache_repository(), "ensure_indexes", None)
+    if ensure_indexes is None:
+        return
+    try:
+        await ensure_indexes()
+    except Exception:
+        logger.warning("Failed to ensure search cache indexes; entries may not expire", exc_info=True)
+
+
+async def shutdown_resources() -> None:
+    """Close long-lived clients and background tasks created by the dependency factories."""
+    if get_provider_repository.cache_info().currsize:
+        await get_provider_repository().aclose()
+    if get_cache_repository.cache_info().currsize:
+        await get_cache_repository().aclose()
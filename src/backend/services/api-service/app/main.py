@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.dependencies import get_cache_warmer, shutdown_resources, startup_resources
 from app.routes import router
 from common.config import get_settings
 from common.errors import APIError
@@ -14,10 +17,27 @@ from common.logging import configure_logging
 settings = get_settings()
 configure_logging(settings.log_level)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own long-lived resources (pooled provider clients) for the lifetime of the app.
+
+    Cache warm-up runs in the background so ``/health`` answers at once; ``/ready`` reports
+    ready only after warm-up completes or times out.
+    """
+    await startup_resources()
+    warm_up = asyncio.create_task(get_cache_warmer().run())
+    yield
+    warm_up.cancel()
+    await asyncio.gather(warm_up, return_exceptions=True)
+    await shutdown_resources()
+
+
 app = FastAPI(
     title=settings.api_title,
     description="FastAPI gateway for TicketWise search, provider aggregation, and health endpoints.",
     version=settings.api_version,
+    lifespan=lifespan,
 )
 
 # Configure CORS for early development; narrow before production rollout.
@@ -37,6 +57,14 @@ async def health_check():
     return {"status": "ok", "service": "api-service", "env": settings.env}
 
 
+@app.get("/ready", tags=["Health"], summary="Readiness check (search cache warmed)")
+async def readiness_check():
+    warmer = get_cache_warmer()
+    if not warmer.ready:
+        return JSONResponse(status_code=503, content={"status": "warming", "warmed": warmer.warmed})
+    return {"status": "ready", "warmed": warmer.warmed}
+
+
 @app.get("/")
 async def root():
     return {"message": "TicketWise API Service is running", "version": settings.api_version}
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import time
-from dataclasses import dataclass
+from collections import Counter, OrderedDict
+from contextlib import aclosing
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Protocol, Sequence
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Set, Tuple
 
 import httpx
 
+from common.jsonstream import JsonArrayStream
+from common.matching import EventKeys, FuzzyTermResolver, SearchTerms, key_tokens, keys_match
+from common.metrics import LatencyHistogram, ProviderCallStats
+from common.normalization import merge_events, sort_events
+from common.search_index import SubstringIndex, StartTimeIndex
+from common.serialization import encode_search_response, validate_events
+from common.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    HedgeBudget,
+    ProviderError,
+    TokenBucketRateLimiter,
+    backoff_delay,
+)
 from app.schemas import (
     Currency,
     Event,
@@ -15,12 +34,15 @@ from app.schemas import (
     Price,
     ProviderHealth,
     ProviderStatus,
+    RateLimitState,
     SearchRequest,
     SeatDetails,
     TicketListing,
     UserProfile,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ProviderRepository(Protocol):
     async def search(self, request: SearchRequest) -> List[Event]:
@@ -29,13 +51,75 @@ class ProviderRepository(Protocol):
     async def status(self) -> List[ProviderStatus]:
         """Return provider health snapshots."""
 
+    async def aclose(self) -> None:
+        """Release pooled resources such as HTTP connections."""
+
+
+class CacheFreshness(str, Enum):
+    FRESH = "fresh"
+    # Past the TTL but inside the stale-while-revalidate window: serve, then refresh.
+    STALE = "stale"
+    # Past the TTL but inside the stale-if-error window: serve only if a refresh fails.
+    STALE_IF_ERROR = "stale_if_error"
+
+
+@dataclass(frozen=True)
+class CachedSearch:
+    events: List[Event]
+    freshness: CacheFreshness
+    # Seconds until the entry stops being fresh (negative once stale).
+    fresh_for_seconds: float = 0.0
+    # Encoded ``SearchResponse`` JSON, when the cache keeps it next to the events.
+    body: Optional[bytes] = None
+    # The request limit the events were fetched with; fewer events means the set is complete.
+    limit: Optional[int] = None
+
+    def covers(self, limit: int) -> bool:
+        """Return True when these events answer a request for ``limit`` results."""
+        return len(self.events) >= limit or (self.limit is not None and len(self.events) < self.limit)
+
+    def sliced(self, limit: int) -> "CachedSearch":
+        """Return the first ``limit`` events (the encoded body only applies to the full set)."""
+        if len(self.events) <= limit:
+            return self
+        return replace(self, events=self.events[:limit], body=None)
+
+
+def cache_freshness(
+    age_seconds: float,
+    ttl_seconds: float,
+    stale_while_revalidate_seconds: float = 0,
+    stale_if_error_seconds: float = 0,
+) -> Optional[CacheFreshness]:
+    """Classify a cache entry by age; ``None`` means it is past every window and unusable."""
+    if age_seconds <= ttl_seconds:
+        return CacheFreshness.FRESH
+    if age_seconds <= ttl_seconds + stale_while_revalidate_seconds:
+        return CacheFreshness.STALE
+    if age_seconds <= ttl_seconds + stale_if_error_seconds:
+        return CacheFreshness.STALE_IF_ERROR
+    return None
+
 
 class SearchCacheRepository(Protocol):
     async def get(self, key: str) -> Optional[List[Event]]:
-        """Return cached events for the given key."""
+        """Return cached events for the given key while they are fresh."""
 
-    async def set(self, key: str, events: List[Event]) -> None:
-        """Cache a collection of events."""
+    async def lookup(self, key: str) -> Optional[CachedSearch]:
+        """Return cached events with their freshness, including stale entries still retained."""
+
+    async def set(
+        self,
+        key: str,
+        events: List[Event],
+        body: Optional[bytes] = None,
+        limit: Optional[int] = None,
+        request: Optional[SearchRequest] = None,
+    ) -> None:
+        """Cache events fetched with ``limit``, optionally with their encoded body and request."""
+
+    async def aclose(self) -> None:
+        """Stop background maintenance and release resources."""
 
 
 class UserProfileRepository(Protocol):
@@ -56,101 +140,197 @@ class FavoritesRepository(Protocol):
     async def delete_favorite(self, user_id: str, favorite: Favorite) -> None:
         """Remove a favorite."""
 
+    async def popular(self, limit: int) -> List[Favorite]:
+        """Return the favorites most users share, most common first."""
+
+
+def sample_events(provider_id: str) -> List[Event]:
+    """Demo catalog served by the stub providers."""
+    return [
+        Event(
+            event_id="evt-001",
+            title="Barcelona vs Real Madrid",
+            league="La Liga",
+            venue="Camp Nou, Barcelona",
+            start_at=datetime(2024, 9, 14, 19, 30, tzinfo=timezone.utc),
+            teams=["FC Barcelona", "Real Madrid"],
+            listings=[
+                TicketListing(
+                    listing_id="list-001",
+                    provider=provider_id,
+                    url="https://tickets.example.com/barca-real",
+                    price=Price(amount=125.0, currency=Currency.EUR),
+                    seat=SeatDetails(section="Lower", row="12", seat="18"),
+                    is_best_price=True,
+                    fetched_at=datetime.now(timezone.utc),
+                )
+            ],
+        ),
+        Event(
+            event_id="evt-002",
+            title="New York Yankees vs Boston Red Sox",
+            league="MLB",
+            venue="Yankee Stadium, New York",
+            start_at=datetime(2024, 7, 2, 18, 10, tzinfo=timezone.utc),
+            teams=["New York Yankees", "Boston Red Sox"],
+            listings=[
+                TicketListing(
+                    listing_id="list-002",
+                    provider=provider_id,
+                    url="https://tickets.example.com/yankees-redsox",
+                    price=Price(amount=85.0, currency=Currency.USD),
+                    seat=SeatDetails(section="Main", row="7", seat="4"),
+                    is_best_price=True,
+                    fetched_at=datetime.now(timezone.utc),
+                )
+            ],
+        ),
+        Event(
+            event_id="evt-003",
+            title="Los Angeles Lakers vs Golden State Warriors",
+            league="NBA",
+            venue="Crypto.com Arena, Los Angeles",
+            start_at=datetime(2024, 11, 10, 20, 0, tzinfo=timezone.utc),
+            teams=["Los Angeles Lakers", "Golden State Warriors"],
+            listings=[
+                TicketListing(
+                    listing_id="list-003",
+                    provider=provider_id,
+                    url="https://tickets.example.com/lakers-warriors",
+                    price=Price(amount=190.0, currency=Currency.USD),
+                    seat=SeatDetails(section="200", row="C"),
+                    is_best_price=True,
+                    fetched_at=datetime.now(timezone.utc),
+                )
+            ],
+        ),
+    ]
+
 
 class InMemoryProviderRepository:
-    """Simple in-memory provider to unblock early integration work."""
+    """In-memory provider backed by inverted token indexes over event text fields.
 
-    def __init__(self) -> None:
+    Events are normalized once when added (``EventKeys``); their title/league/venue/team
+    tokens are indexed and events are kept ordered by start time. A search bisects that order
+    to the requested date window, intersects the posting sets of tokens containing each query
+    and filter word (a superset of the substring matches ``keys_match`` accepts), then verifies
+    candidates in start-time order and stops at ``limit``. A search that finds nothing
+    is retried once with misspelled query/team words corrected by trigram similarity.
+    """
+
+    def __init__(self, events: Optional[Sequence[Event]] = None, fuzzy_threshold: Optional[float] = 0.5) -> None:
         self.provider_id = "sample-tickets"
-        self._events: List[Event] = [
-            Event(
-                event_id="evt-001",
-                title="Barcelona vs Real Madrid",
-                league="La Liga",
-                venue="Camp Nou, Barcelona",
-                start_at=datetime(2024, 9, 14, 19, 30, tzinfo=timezone.utc),
-                teams=["FC Barcelona", "Real Madrid"],
-                listings=[
-                    TicketListing(
-                        listing_id="list-001",
-                        provider=self.provider_id,
-                        url="https://tickets.example.com/barca-real",
-                        price=Price(amount=125.0, currency=Currency.EUR),
-                        seat=SeatDetails(section="Lower", row="12", seat="18"),
-                        is_best_price=True,
-                        fetched_at=datetime.now(timezone.utc),
-                    )
-                ],
-            ),
-            Event(
-                event_id="evt-002",
-                title="New York Yankees vs Boston Red Sox",
-                league="MLB",
-                venue="Yankee Stadium, New York",
-                start_at=datetime(2024, 7, 2, 18, 10, tzinfo=timezone.utc),
-                teams=["New York Yankees", "Boston Red Sox"],
-                listings=[
-                    TicketListing(
-                        listing_id="list-002",
-                        provider=self.provider_id,
-                        url="https://tickets.example.com/yankees-redsox",
-                        price=Price(amount=85.0, currency=Currency.USD),
-                        seat=SeatDetails(section="Main", row="7", seat="4"),
-                        is_best_price=True,
-                        fetched_at=datetime.now(timezone.utc),
-                    )
-                ],
-            ),
-            Event(
-                event_id="evt-003",
-                title="Los Angeles Lakers vs Golden State Warriors",
-                league="NBA",
-                venue="Crypto.com Arena, Los Angeles",
-                start_at=datetime(2024, 11, 10, 20, 0, tzinfo=timezone.utc),
-                teams=["Los Angeles Lakers", "Golden State Warriors"],
-                listings=[
-                    TicketListing(
-                        listing_id="list-003",
-                        provider=self.provider_id,
-                        url="https://tickets.example.com/lakers-warriors",
-                        price=Price(amount=190.0, currency=Currency.USD),
-                        seat=SeatDetails(section="200", row="C"),
-                        is_best_price=True,
-                        fetched_at=datetime.now(timezone.utc),
-                    )
-                ],
-            ),
-        ]
+        self._events: Dict[int, Event] = {}
+        self._keys: Dict[int, EventKeys] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._next_doc_id = 0
+        self._text_index = SubstringIndex()
+        self._team_index = SubstringIndex()
+        self._league_index = SubstringIndex()
+        self._venue_index = SubstringIndex()
+        self._start_index = StartTimeIndex()
+        self._fuzzy = FuzzyTermResolver(fuzzy_threshold) if fuzzy_threshold else None
+        self.add_events(sample_events(self.provider_id) if events is None else events)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add_events(self, events: Iterable[Event]) -> None:
+        """Index events, replacing any already held with the same ``event_id``."""
+        # Last copy of an ``event_id`` wins; start times are only written to the index after the
+        # loop, so an earlier copy in the same batch could not be removed from it otherwise.
+        batch = {event.event_id: event for event in events}
+        added: List[Tuple[int, datetime]] = []
+        for event in batch.values():
+            self.remove_event(event.event_id)
+            doc_id = self._next_doc_id
+            self._next_doc_id += 1
+            self._events[doc_id] = event
+            self._keys[doc_id] = keys = EventKeys.from_event(event)
+            self._doc_ids[event.event_id] = doc_id
+            self._index(doc_id, keys)
+            if self._fuzzy is not None:
+                self._fuzzy.add([keys.teams], [keys.league, keys.venue])
+            added.append((doc_id, event.start_at))
+        self._start_index.add_many(added)
+
+    def remove_event(self, event_id: str) -> bool:
+        doc_id = self._doc_ids.pop(event_id, None)
+        if doc_id is None:
+            return False
+        del self._events[doc_id]
+        self._index(doc_id, self._keys.pop(doc_id), remove=True)
+        self._start_index.remove(doc_id)
+        return True
+
+    def _index(self, doc_id: int, keys: EventKeys, remove: bool = False) -> None:
+        fields = (
+            (self._text_index, key_tokens(keys.text)),
+            (self._team_index, key_tokens(keys.teams)),
+            (self._league_index, key_tokens(keys.league)),
+            (self._venue_index, key_tokens(keys.venue)),
+        )
+        for index, tokens in fields:
+            if remove:
+                index.remove(doc_id, tokens)
+            else:
+                index.add(doc_id, tokens)
 
     async def search(self, request: SearchRequest) -> List[Event]:
-        query = request.query.lower().strip() if request.query else None
-        filters = request.filters
+        return self.find(request)
+
+    def find(self, request: SearchRequest, correct_spelling: bool = True) -> List[Event]:
+        """Synchronous search over the indexes, retrying with corrected spellings on a miss."""
+        terms = SearchTerms.from_request(request)
+        matched = self.find_terms(terms, request)
+        if matched or not correct_spelling or self._fuzzy is None:
+            return matched
+        corrected = self._fuzzy.resolve(terms)
+        if corrected is not None:
+            matched = self.find_terms(corrected, request)
+        return matched
+
+    def find_terms(self, terms: SearchTerms, request: SearchRequest) -> List[Event]:
+        """Search with already normalized (possibly corrected) terms, without a spelling retry."""
+        lo, hi = self._start_index.window(request.filters.date_from, request.filters.date_to)
+        candidates = self._candidates(terms)
+        if candidates is None:
+            doc_ids: Iterable[int] = self._start_index.ids(lo, hi)
+        elif len(candidates) ** 2 > request.limit * (hi - lo):
+            # Dense candidates: walking the date window reaches ``limit`` hits sooner than sorting them all.
+            doc_ids = (doc_id for doc_id in self._start_index.ids(lo, hi) if doc_id in candidates)
+        else:
+            doc_ids = sorted(candidates, key=self._start_index.sort_key)
 
         matched: List[Event] = []
-        for event in self._events:
-            if query and not self._matches_query(event, query):
-                continue
-            if filters.team and not any(filters.team.lower() in team.lower() for team in event.teams):
+        for doc_id in doc_ids:
+            if not keys_match(self._keys[doc_id], terms):
                 continue
-            if filters.league and (not event.league or filters.league.lower() not in event.league.lower()):
-                continue
-            if filters.location and (not event.venue or filters.location.lower() not in event.venue.lower()):
-                continue
-            if filters.date_from and event.start_at < filters.date_from:
-                continue
-            if filters.date_to and event.start_at > filters.date_to:
-                continue
-
-            matched.append(event)
+            matched.append(self._events[doc_id])
             if len(matched) >= request.limit:
                 break
 
         return matched
 
-    @staticmethod
-    def _matches_query(event: Event, query: str) -> bool:
-        haystack = [event.title, event.league or "", event.venue or ""] + event.teams
-        return any(query in value.lower() for value in haystack)
+    def _candidates(self, terms: SearchTerms) -> Optional[Set[int]]:
+        """Intersect posting sets for the query and text filters; ``None`` means unconstrained."""
+        fields = (
+            (self._text_index, terms.query),
+            (self._team_index, terms.team),
+            (self._league_index, terms.league),
+            (self._venue_index, terms.location),
+        )
+        postings = [index.match_all(tokens) for index, value in fields if value and (tokens := key_tokens(value))]
+        if not postings:
+            return None
+
+        postings.sort(key=len)
+        result = postings[0]
+        for other in postings[1:]:
+            if not result:
+                break
+            result = result & other
+        return result
 
     async def status(self) -> List[ProviderStatus]:
         now = datetime.now(timezone.utc)
@@ -159,34 +339,221 @@ class InMemoryProviderRepository:
                 provider_id=self.provider_id,
                 status=ProviderHealth.HEALTHY,
                 last_success_at=now,
-                latency_ms=120,
             )
         ]
 
+    async def aclose(self) -> None:
+        return None
+
+
+@dataclass
+class _CacheEntry:
+    stored_at: float
+    ttl_seconds: float
+    events: List[Event]
+    body: bytes
+    limit: Optional[int]
+
 
 class InMemorySearchCache(SearchCacheRepository):
-    """In-memory TTL cache for search results."""
+    """Bounded in-memory TTL cache for search results with LRU eviction.
+
+    Each entry keeps the events and their encoded ``SearchResponse`` body, so hits can be
+    sent without re-serializing. Entries are capped by count and by a byte budget (the size
+    of those bodies); the least recently used entries are evicted first. Expired entries are
+    dropped on read and by a background sweep task started with the first write. Every
+    operation completes without awaiting, so no lock is needed on the event loop.
+
+    With ``stale_while_revalidate_seconds``/``stale_if_error_seconds`` set, entries are kept
+    past the TTL for the longer of the two windows and ``lookup`` reports them as stale.
+    """
 
-    def __init__(self, ttl_seconds: int = 120) -> None:
+    def __init__(
+        self,
+        ttl_seconds: int = 120,
+        max_entries: int = 10_000,
+        max_bytes: Optional[int] = None,
+        sweep_interval_seconds: float = 30.0,
+        stale_while_revalidate_seconds: int = 0,
+        stale_if_error_seconds: int = 0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, tuple[float, List[Event]]] = {}
-        self._lock = asyncio.Lock()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.stale_while_revalidate_seconds = stale_while_revalidate_seconds
+        self.stale_if_error_seconds = stale_if_error_seconds
+        self.evictions = 0
+        self._clock = clock
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def retention_seconds(self) -> int:
+        return self.ttl_seconds + max(self.stale_while_revalidate_seconds, self.stale_if_error_seconds)
 
     async def get(self, key: str) -> Optional[List[Event]]:
-        async with self._lock:
-            record = self._cache.get(key)
-            if record is None:
-                return None
+        cached = await self.lookup(key)
+        if cached is None or cached.freshness is not CacheFreshness.FRESH:
+            return None
+        return cached.events
 
-            expires_at, events = record
-            if expires_at < time.time():
-                self._cache.pop(key, None)
-                return None
-            return events
+    async def lookup(self, key: str) -> Optional[CachedSearch]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        age = self._clock() - entry.stored_at
+        freshness = cache_freshness(
+            age, entry.ttl_seconds, self.stale_while_revalidate_seconds, self.stale_if_error_seconds
+        )
+        if freshness is None:
+            self._discard(key)
+            return None
+        self._cache.move_to_end(key)
+        return CachedSearch(
+            events=entry.events,
+            freshness=freshness,
+            fresh_for_seconds=entry.ttl_seconds - age,
+            body=entry.body,
+            limit=entry.limit,
+        )
 
-    async def set(self, key: str, events: List[Event]) -> None:
-        async with self._lock:
-            self._cache[key] = (time.time() + self.ttl_seconds, events)
+    async def set(
+        self,
+        key: str,
+        events: List[Event],
+        body: Optional[bytes] = None,
+        limit: Optional[int] = None,
+        request: Optional[SearchRequest] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """Cache events; ``ttl_seconds`` shortens the TTL for this entry (never extends it)."""
+        self._ensure_sweeper()
+        if body is None:
+            body = encode_search_response(events)
+        # Drop the previous result first: an oversize replacement must not leave it served as fresh.
+        self._discard(key)
+        if self.max_bytes is not None and len(body) > self.max_bytes:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        self._cache[key] = _CacheEntry(
+            stored_at=self._clock(), ttl_seconds=ttl, events=events, body=body, limit=limit
+        )
+        self._bytes += len(body)
+        while len(self._cache) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+            oldest = next(iter(self._cache))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry and return how many were removed."""
+        now = self._clock()
+        stale_seconds = self.retention_seconds - self.ttl_seconds
+        expired = [
+            key for key, entry in self._cache.items() if now - entry.stored_at > entry.ttl_seconds + stale_seconds
+        ]
+        for key in expired:
+            self._discard(key)
+        return len(expired)
+
+    async def aclose(self) -> None:
+        sweeper, self._sweeper = self._sweeper, None
+        # A sweeper started on another (possibly closed) event loop cannot be awaited from here.
+        if sweeper is not None and sweeper.get_loop() is asyncio.get_running_loop():
+            sweeper.cancel()
+            await asyncio.gather(sweeper, return_exceptions=True)
+
+    def _discard(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def _ensure_sweeper(self) -> None:
+        sweeper = self._sweeper
+        if sweeper is None or sweeper.done() or sweeper.get_loop() is not asyncio.get_running_loop():
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            self.purge_expired()
+
+
+class LayeredSearchCache(SearchCacheRepository):
+    """Two-tier search cache: a small in-process L1 in front of a shared L2 (e.g. Mongo).
+
+    Reads try L1 first and fall back to L2; fresh L2 hits are promoted into L1 for no longer
+    than L2 still considers them fresh, so a worker never serves an entry L2 has expired.
+    Writes go through to both tiers. L2 failures are logged and the cache degrades to L1.
+    """
+
+    def __init__(self, l1: InMemorySearchCache, l2: SearchCacheRepository) -> None:
+        self.l1 = l1
+        self.l2 = l2
+
+    async def get(self, key: str) -> Optional[List[Event]]:
+        cached = await self.lookup(key)
+        if cached is None or cached.freshness is not CacheFreshness.FRESH:
+            return None
+        return cached.events
+
+    async def lookup(self, key: str) -> Optional[CachedSearch]:
+        local = await self.l1.lookup(key)
+        if local is not None and local.freshness is CacheFreshness.FRESH:
+            return local
+        try:
+            shared = await self.l2.lookup(key)
+        except Exception:
+            logger.warning("L2 search cache lookup failed; using L1 only", exc_info=True)
+            return local
+        if shared is None:
+            return local
+        if shared.freshness is CacheFreshness.FRESH:
+            await self.l1.set(
+                key, shared.events, body=shared.body, limit=shared.limit, ttl_seconds=shared.fresh_for_seconds
+            )
+        return shared
+
+    async def ensure_indexes(self) -> None:
+        ensure = getattr(self.l2, "ensure_indexes", None)
+        if ensure is not None:
+            await ensure()
+
+    async def popular_requests(self, limit: int) -> List[SearchRequest]:
+        popular = getattr(self.l2, "popular_requests", None)
+        return await popular(limit) if popular is not None else []
+
+    async def expiring_keys(self, keys: Sequence[str], within_seconds: float) -> Set[str]:
+        """Judge by L2: an L1 copy never outlives L2 freshness, so only L2 needs refreshing."""
+        expiring = getattr(self.l2, "expiring_keys", None)
+        return await expiring(keys, within_seconds) if expiring is not None else set(keys)
+
+    async def set(
+        self,
+        key: str,
+        events: List[Event],
+        body: Optional[bytes] = None,
+        limit: Optional[int] = None,
+        request: Optional[SearchRequest] = None,
+    ) -> None:
+        await self.l1.set(key, events, body=body, limit=limit)
+        try:
+            await self.l2.set(key, events, body=body, limit=limit, request=request)
+        except Exception:
+            logger.warning("L2 search cache write failed; entry kept in L1 only", exc_info=True)
+
+    async def aclose(self) -> None:
+        await self.l1.aclose()
+        await self.l2.aclose()
 
 
 class InMemoryUserProfileRepository(UserProfileRepository, FavoritesRepository):
@@ -221,93 +588,536 @@ class InMemoryUserProfileRepository(UserProfileRepository, FavoritesRepository):
             return
         profile.favorites = [f for f in profile.favorites if f != favorite]
 
+    async def popular(self, limit: int) -> List[Favorite]:
+        counts = Counter(
+            (favorite.type, favorite.name) for profile in self._profiles.values() for favorite in profile.favorites
+        )
+        return [Favorite(type=kind, name=name) for (kind, name), _ in counts.most_common(limit)]
+
+
+@dataclass
+class ProviderQueryMapping:
+    """Maps a SearchRequest onto a provider's query parameters and paginated response shape.
+
+    Parameter names set to ``None`` are not sent. Responses are either a bare JSON array
+    (``items_field=None``, next cursor in ``next_cursor_header``) or an envelope object whose
+    ``items_field`` holds the events and ``next_cursor_field`` the next page cursor.
+    """
+
+    path: str = "/events"
+    query_param: Optional[str] = "q"
+    team_param: Optional[str] = "team"
+    league_param: Optional[str] = "league"
+    location_param: Optional[str] = "location"
+    date_from_param: Optional[str] = "date_from"
+    date_to_param: Optional[str] = "date_to"
+    limit_param: Optional[str] = "limit"
+    cursor_param: Optional[str] = "cursor"
+    items_field: Optional[str] = None
+    next_cursor_field: Optional[str] = "next_cursor"
+    next_cursor_header: Optional[str] = "X-Next-Cursor"
+    max_page_size: int = 100
+
+    def build_params(self, request: SearchRequest, page_size: int, cursor: Optional[str] = None) -> Dict[str, str]:
+        filters = request.filters
+        values = {
+            self.query_param: request.query,
+            self.team_param: filters.team,
+            self.league_param: filters.league,
+            self.location_param: filters.location,
+            self.date_from_param: filters.date_from.isoformat() if filters.date_from else None,
+            self.date_to_param: filters.date_to.isoformat() if filters.date_to else None,
+            self.limit_param: str(min(page_size, self.max_page_size)),
+            self.cursor_param: cursor,
+        }
+        return {name: value for name, value in values.items() if name and value is not None}
+
+
+@dataclass
+class _ProviderPage:
+    events: List[Event]
+    next_cursor: Optional[str] = None
+
 
 @dataclass
 class HttpProviderConfig:
     provider_id: str
     base_url: str
     timeout_seconds: float = 5.0
+    # One pooled client per provider keeps keep-alive connections between searches.
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = False
+    # Transport errors, 5xx and 429 are retried with jittered exponential backoff.
+    max_retries: int = 2
+    retry_backoff_base_seconds: float = 0.1
+    retry_backoff_max_seconds: float = 1.0
+    # Consecutive failures that open the breaker; while open, searches fail fast.
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout_seconds: float = 30.0
+    # Duplicate a request still pending after the observed ``hedge_percentile`` latency; first response wins.
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20
+    hedge_min_delay_seconds: float = 0.01
+    hedge_budget_ratio: float = 0.1
+    # Decode the event array incrementally and close the connection once ``limit`` events are built.
+    stream_events: bool = False
+    # Provider cursors followed per search, only until enough matching events are collected.
+    max_pages: int = 5
+    # Token-bucket pacing; a full wait queue fails the search with ``RateLimitExceededError``.
+    rate_limit_per_second: Optional[float] = None
+    rate_limit_burst: int = 10
+    rate_limit_max_queue: int = 50
+    rate_limit_max_wait_seconds: float = 1.0
+    # Pushes filters and the limit down as query parameters.
+    query_mapping: ProviderQueryMapping = field(default_factory=ProviderQueryMapping)
 
 
 class HttpProviderRepository(ProviderRepository):
-    """HTTP-based provider client with basic retry/backoff stub."""
+    """HTTP-based provider client with pooling, retries, hedging and rate limiting."""
 
-    def __init__(self, config: HttpProviderConfig) -> None:
+    def __init__(self, config: HttpProviderConfig, client: Optional[httpx.AsyncClient] = None) -> None:
         self.config = config
+        self._client = client
+        self._breaker = CircuitBreaker(
+            failure_threshold=config.circuit_failure_threshold,
+            reset_timeout_seconds=config.circuit_reset_timeout_seconds,
+        )
+        self._latency = LatencyHistogram()
+        self._hedge_budget = HedgeBudget(ratio=config.hedge_budget_ratio)
+        self._rate_limiter: Optional[TokenBucketRateLimiter] = None
+        if config.rate_limit_per_second:
+            self._rate_limiter = TokenBucketRateLimiter(
+                rate_per_second=config.rate_limit_per_second,
+                burst=config.rate_limit_burst,
+                max_queue=config.rate_limit_max_queue,
+                max_wait_seconds=config.rate_limit_max_wait_seconds,
+            )
         self._last_error: Optional[str] = None
         self._last_success_at: Optional[datetime] = None
 
+    @property
+    def provider_id(self) -> str:
+        return self.config.provider_id
+
     async def search(self, request: SearchRequest) -> List[Event]:
-        params = request.model_dump(exclude_none=True)
+        """Fetch pages with the request's filters pushed down until ``limit`` events are collected."""
+        events: List[Event] = []
+        cursor: Optional[str] = None
         try:
-            async with httpx.AsyncClient(base_url=self.config.base_url, timeout=self.config.timeout_seconds) as client:
-                response = await client.get("/events", params=params)
-                response.raise_for_status()
-                raw_events = response.json()
-                events = [self._to_event(item) for item in raw_events]
-                self._last_success_at = datetime.now(timezone.utc)
-                return events[: request.limit]
-        except Exception as exc:  # pragma: no cover - network failures handled as stub
-            self._last_error = str(exc)
+            for _ in range(self.config.max_pages):
+                remaining = request.limit - len(events)
+                params = self.config.query_mapping.build_params(request, page_size=remaining, cursor=cursor)
+                page = await self._fetch_with_retries(params, request, remaining)
+                events.extend(page.events)
+                if len(events) >= request.limit or not page.next_cursor:
+                    break
+                cursor = page.next_cursor
+        except Exception as exc:
+            self._last_error = _truncate_error(str(exc) or exc.__class__.__name__)
             raise
+        self._last_success_at = datetime.now(timezone.utc)
+        return events[: request.limit]
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_with_retries(self, params: Dict[str, str], request: SearchRequest, limit: int) -> _ProviderPage:
+        """Fetch one page behind the circuit breaker and rate limiter, retrying transient failures."""
+        attempt = 0
+        while True:
+            # Check the breaker before pacing so an open circuit fails fast without spending tokens.
+            if not self._breaker.allow_request():
+                raise CircuitOpenError(f"Circuit open for provider {self.provider_id}")
+            if self._rate_limiter is not None:
+                try:
+                    await self._rate_limiter.acquire()
+                except BaseException:
+                    # Nothing was sent, so a half-open probe slot goes back unjudged.
+                    self._breaker.release_probe()
+                    raise
+            try:
+                page = await self._fetch_hedged(params, request, limit)
+            except asyncio.CancelledError:
+                self._breaker.record_failure()
+                raise
+            except Exception as exc:
+                if isinstance(exc, httpx.HTTPStatusError) and not _is_retryable(exc):
+                    # A 4xx rejects our request, not the provider's health: leave the breaker as it was.
+                    self._breaker.release_probe()
+                    raise
+                self._breaker.record_failure()
+                if not _is_retryable(exc):
+                    # A broken payload (bad JSON, invalid events) counts against the provider but is not retried.
+                    raise
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = backoff_delay(
+                    attempt, self.config.retry_backoff_base_seconds, self.config.retry_backoff_max_seconds
+                )
+                attempt += 1
+                logger.warning(
+                    "Provider %s request failed (%s); retry %d/%d in %.3fs",
+                    self.provider_id,
+                    exc,
+                    attempt,
+                    self.config.max_retries,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+            self._breaker.record_success()
+            return page
+
+    async def _fetch_hedged(self, params: Dict[str, str], request: SearchRequest, limit: int) -> _ProviderPage:
+        """Fetch one page, sending a budgeted duplicate if the first is slower than usual."""
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._fetch(params, request, limit)
+
+        self._hedge_budget.record_request()
+        pending = {asyncio.create_task(self._fetch(params, request, limit))}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done and self._can_hedge():
+                logger.info("Hedging request to provider %s after %.3fs", self.provider_id, delay)
+                pending.add(asyncio.create_task(self._fetch(params, request, limit)))
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner: Optional[asyncio.Task[_ProviderPage]] = None
+                # Read every finished task's outcome so a loser's failure is never left unretrieved.
+                for task in done:
+                    exc = task.exception()
+                    if exc is not None:
+                        error = exc
+                    elif winner is None:
+                        winner = task
+                if winner is not None:
+                    return winner.result()
+            raise error or ProviderError(f"No response from provider {self.provider_id}")
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _can_hedge(self) -> bool:
+        # Ask the budget first: it refuses most hedges, and those must not cost a limiter token.
+        if not self._hedge_budget.try_acquire():
+            return False
+        if self._rate_limiter is not None and not self._rate_limiter.try_acquire():
+            self._hedge_budget.release()
+            return False
+        return True
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.config.hedge_enabled or self._latency.count() < self.config.hedge_min_samples:
+            return None
+        latency_ms = self._latency.percentile(self.config.hedge_percentile)
+        if latency_ms is None:
+            return None
+        return max(self.config.hedge_min_delay_seconds, latency_ms / 1000.0)
+
+    async def _fetch(self, params: Dict[str, str], request: SearchRequest, limit: int) -> _ProviderPage:
+        started = time.perf_counter()
+        if self.config.stream_events:
+            page = await self._fetch_streaming(params, request, limit)
+        else:
+            page = await self._fetch_buffered(params, request, limit)
+        self._latency.record((time.perf_counter() - started) * 1000.0)
+        return page
+
+    async def _fetch_buffered(self, params: Dict[str, str], request: SearchRequest, limit: int) -> _ProviderPage:
+        mapping = self.config.query_mapping
+        response = await self._get_client().get(mapping.path, params=params)
+        response.raise_for_status()
+        body = response.json()
+
+        raw_events = body.get(mapping.items_field, []) if mapping.items_field else body
+        events = await self._collect_events(_iterate(raw_events), request, limit)
+        metadata = body if mapping.items_field else {}
+        return _ProviderPage(events=events, next_cursor=self._next_cursor(response, metadata))
+
+    async def _fetch_streaming(self, params: Dict[str, str], request: SearchRequest, limit: int) -> _ProviderPage:
+        mapping = self.config.query_mapping
+        async with self._get_client().stream("GET", mapping.path, params=params) as response:
+            response.raise_for_status()
+            stream = JsonArrayStream(response.aiter_text(), items_key=mapping.items_field)
+            async with aclosing(stream.__aiter__()) as items:
+                events = await self._collect_events(items, request, limit)
+        return _ProviderPage(events=events, next_cursor=self._next_cursor(response, stream.metadata))
+
+    async def _collect_events(
+        self, items: AsyncIterator[Dict[str, Any]], request: SearchRequest, limit: int
+    ) -> List[Event]:
+        """Convert payloads in batches sized to the events still needed, stopping at ``limit`` matches."""
+        fetched_at = datetime.now(timezone.utc)
+        terms = SearchTerms.from_request(request)
+        events: List[Event] = []
+        batch: List[Dict[str, Any]] = []
+        async for item in items:
+            batch.append(self._to_event_payload(item, fetched_at))
+            if len(batch) >= limit - len(events):
+                events.extend(event for event in validate_events(batch) if keys_match(EventKeys.from_event(event), terms))
+                batch = []
+                if len(events) >= limit:
+                    break
+        if batch:
+            events.extend(event for event in validate_events(batch) if keys_match(EventKeys.from_event(event), terms))
+        return events[:limit]
+
+    def _next_cursor(self, response: httpx.Response, metadata: Dict[str, object]) -> Optional[str]:
+        mapping = self.config.query_mapping
+        cursor = metadata.get(mapping.next_cursor_field) if mapping.next_cursor_field else None
+        if cursor is None and mapping.next_cursor_header:
+            cursor = response.headers.get(mapping.next_cursor_header)
+        return str(cursor) if cursor else None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry_seconds,
+        )
+        try:
+            return httpx.AsyncClient(
+                base_url=self.config.base_url,
+                timeout=self.config.timeout_seconds,
+                limits=limits,
+                http2=self.config.http2,
+            )
+        except ImportError:
+            logger.warning("HTTP/2 requested for provider %s but the h2 package is missing", self.provider_id)
+            return httpx.AsyncClient(base_url=self.config.base_url, timeout=self.config.timeout_seconds, limits=limits)
 
     async def status(self) -> List[ProviderStatus]:
-        status = ProviderHealth.HEALTHY if self._last_error is None else ProviderHealth.DEGRADED
+        state = self._breaker.state
+        if state == CircuitState.OPEN:
+            status = ProviderHealth.DOWN
+        elif state == CircuitState.HALF_OPEN or self._breaker.consecutive_failures:
+            status = ProviderHealth.DEGRADED
+        elif self._rate_limiter is not None and self._rate_limiter.saturated:
+            status = ProviderHealth.DEGRADED
+        else:
+            status = ProviderHealth.HEALTHY
         return [
             ProviderStatus(
                 provider_id=self.config.provider_id,
                 status=status,
                 last_success_at=self._last_success_at,
                 last_error=self._last_error,
+                rate_limit=self._rate_limit_state(),
             )
         ]
 
-    def _to_event(self, payload: Dict[str, object]) -> Event:
+    def _rate_limit_state(self) -> Optional[RateLimitState]:
+        limiter = self._rate_limiter
+        if limiter is None:
+            return None
+        return RateLimitState(
+            tokens_available=round(limiter.tokens_available, 3),
+            queued=limiter.waiting,
+            max_queue=limiter.max_queue,
+            rejected_total=limiter.rejected,
+            saturated=limiter.saturated,
+        )
+
+    def _to_event_payload(self, payload: Dict[str, Any], fetched_at: datetime) -> Dict[str, Any]:
         # Minimal mapping stub; real implementation will normalize provider-specific fields.
-        listings_payload = payload.get("listings", [])
-        listings = []
-        for item in listings_payload:
-            listings.append(
-                TicketListing(
-                    listing_id=str(item.get("listing_id")),
-                    provider=self.config.provider_id,
-                    url=str(item.get("url")),
-                    price=Price(amount=float(item.get("price", 0)), currency=Currency(item.get("currency", "USD"))),
-                    seat=SeatDetails(section=item.get("section"), row=item.get("row"), seat=item.get("seat")),
-                    is_best_price=bool(item.get("is_best_price", False)),
-                    fetched_at=datetime.now(timezone.utc),
-                )
-            )
+        listings = [
+            {
+                "listing_id": str(item.get("listing_id")),
+                "provider": self.config.provider_id,
+                "url": str(item.get("url")),
+                "price": {"amount": float(item.get("price", 0)), "currency": item.get("currency", "USD")},
+                "seat": {"section": item.get("section"), "row": item.get("row"), "seat": item.get("seat")},
+                "is_best_price": bool(item.get("is_best_price", False)),
+                "fetched_at": fetched_at,
+            }
+            for item in payload.get("listings", [])
+        ]
 
-        raw_start = payload.get("start_at") or datetime.now(timezone.utc).isoformat()
-        return Event(
-            event_id=str(payload.get("event_id")),
-            title=str(payload.get("title")),
-            league=payload.get("league"),
-            venue=payload.get("venue"),
-            start_at=datetime.fromisoformat(str(raw_start)),
-            teams=list(payload.get("teams", [])),
-            listings=listings,
-        )
+        raw_start = payload.get("start_at")
+        return {
+            "event_id": str(payload.get("event_id")),
+            "title": str(payload.get("title")),
+            "league": payload.get("league"),
+            "venue": payload.get("venue"),
+            "start_at": datetime.fromisoformat(str(raw_start)) if raw_start else fetched_at,
+            "teams": list(payload.get("teams", [])),
+            "listings": listings,
+        }
 
 
 class CompositeProviderRepository(ProviderRepository):
-    """Aggregates multiple provider repositories."""
+    """Aggregates multiple provider repositories with a concurrent, deadline-bound fan-out."""
 
-    def __init__(self, providers: Sequence[ProviderRepository]) -> None:
+    def __init__(
+        self,
+        providers: Sequence[ProviderRepository],
+        search_timeout_seconds: Optional[float] = None,
+        provider_timeout_seconds: Optional[float] = None,
+    ) -> None:
         self.providers = list(providers)
+        self.search_timeout_seconds = search_timeout_seconds
+        self.provider_timeout_seconds = provider_timeout_seconds
+        self._stats: Dict[str, ProviderCallStats] = {
+            _provider_id(provider): ProviderCallStats() for provider in self.providers
+        }
+
+    async def start(self) -> None:
+        """Run providers' optional ``start`` hooks (e.g. spawning worker processes) before traffic."""
+        starters = [start for provider in self.providers if (start := getattr(provider, "start", None)) is not None]
+        await asyncio.gather(*(start() for start in starters))
 
     async def search(self, request: SearchRequest) -> List[Event]:
-        results: List[Event] = []
-        for provider in self.providers:
-            events = await provider.search(request)
-            results.extend(events)
-            if len(results) >= request.limit:
-                break
-        return results[: request.limit]
+        """Merge provider results by start time, dedupe by ``event_id`` and cut at ``limit``.
+
+        Failed providers are skipped; ``ProviderError`` is raised only when every provider failed.
+        """
+        if not self.providers:
+            return []
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(self._search_provider(provider, request)) for provider in self.providers]
+        _, pending = await asyncio.wait(tasks, timeout=self.search_timeout_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        streams: List[List[Event]] = []
+        for provider, task in zip(self.providers, tasks):
+            if task in pending:
+                message = f"search deadline of {self.search_timeout_seconds}s exceeded"
+                self._record_failure(provider, _elapsed_ms(started), message, timed_out=True)
+                continue
+            events = task.result()
+            if events is not None:
+                # Providers usually answer in start-time order already; Timsort checks that in one pass.
+                streams.append(sort_events(events))
+        if not streams:
+            # An outage, not an empty result: lets callers fall back to stale cached results.
+            raise ProviderError(f"All {len(self.providers)} providers failed")
+        return merge_events(streams, request.limit)
 
     async def status(self) -> List[ProviderStatus]:
+        """Provider snapshots enriched with the latency and outcome counters measured here."""
+        snapshots = await asyncio.gather(
+            *(provider.status() for provider in self.providers),
+            return_exceptions=True,
+        )
+
         statuses: List[ProviderStatus] = []
-        for provider in self.providers:
-            statuses.extend(await provider.status())
+        for provider, snapshot in zip(self.providers, snapshots):
+            if isinstance(snapshot, BaseException):
+                statuses.append(
+                    ProviderStatus(
+                        provider_id=_provider_id(provider),
+                        status=ProviderHealth.DOWN,
+                        last_error=_truncate_error(f"status check failed: {snapshot}"),
+                    )
+                )
+                continue
+            for status in snapshot:
+                stats = self._stats.get(status.provider_id)
+                if stats is not None:
+                    status = status.model_copy(update=_stats_update(status, stats))
+                statuses.append(status)
         return statuses
+
+    async def aclose(self) -> None:
+        for provider in self.providers:
+            close = getattr(provider, "aclose", None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception:
+                logger.warning("Failed to close provider %s", _provider_id(provider), exc_info=True)
+
+    async def _search_provider(self, provider: ProviderRepository, request: SearchRequest) -> Optional[List[Event]]:
+        """Search one provider, timing the call into its ``ProviderCallStats``; ``None`` on failure."""
+        started = time.perf_counter()
+        try:
+            events = await asyncio.wait_for(provider.search(request), timeout=self.provider_timeout_seconds)
+        except asyncio.TimeoutError:
+            message = f"timed out after {self.provider_timeout_seconds}s"
+            self._record_failure(provider, _elapsed_ms(started), message, timed_out=True)
+            return None
+        except Exception as exc:
+            self._record_failure(provider, _elapsed_ms(started), str(exc) or exc.__class__.__name__)
+            return None
+
+        self._stats_for(provider).record_success(_elapsed_ms(started))
+        return events
+
+    def _record_failure(
+        self, provider: ProviderRepository, latency_ms: float, message: str, timed_out: bool = False
+    ) -> None:
+        logger.warning("Provider %s failed during search fan-out: %s", _provider_id(provider), message)
+        stats = self._stats_for(provider)
+        if timed_out:
+            stats.record_timeout(latency_ms, _truncate_error(message))
+        else:
+            stats.record_error(latency_ms, _truncate_error(message))
+
+    def _stats_for(self, provider: ProviderRepository) -> ProviderCallStats:
+        return self._stats.setdefault(_provider_id(provider), ProviderCallStats())
+
+
+def _stats_update(status: ProviderStatus, stats: ProviderCallStats) -> Dict[str, object]:
+    p50, p95, p99 = (stats.latency.percentile(p) for p in (50, 95, 99))
+    update: Dict[str, object] = {
+        "latency_ms": round(p50) if p50 is not None else status.latency_ms,
+        "latency_p50_ms": _round_ms(p50),
+        "latency_p95_ms": _round_ms(p95),
+        "latency_p99_ms": _round_ms(p99),
+        "success_count": stats.success_count,
+        "error_count": stats.error_count,
+        "timeout_count": stats.timeout_count,
+    }
+    if stats.last_call_failed and status.status == ProviderHealth.HEALTHY:
+        update["status"] = ProviderHealth.DEGRADED
+        update["last_error"] = stats.last_error
+    return update
+
+
+def _round_ms(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000.0
+
+
+def _provider_id(provider: ProviderRepository) -> str:
+    return str(getattr(provider, "provider_id", None) or provider.__class__.__name__)
+
+
+async def _iterate(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 429
+    return False
+
+
+def _truncate_error(message: str, max_length: int = 256) -> str:
+    return message if len(message) <= max_length else message[: max_length - 3] + "..."
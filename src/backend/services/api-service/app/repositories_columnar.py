@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import re
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.repositories import ProviderRepository
+from app.schemas import Currency, Event, ProviderHealth, ProviderStatus, SearchRequest
+from common.matching import FuzzyTermResolver, SearchTerms
+from common.serialization import validate_events
+from common.text import search_key
+
+try:  # numpy is optional; only this backend needs it.
+    import numpy as np
+    from numpy.dtypes import StringDType
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+    StringDType = None
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_CURRENCIES = list(Currency)
+
+
+def _epoch_us(value: datetime) -> int:
+    """Exact microseconds since the epoch, treating naive datetimes as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class _Dictionary:
+    """Dictionary encoding for a low-cardinality string column (``-1`` encodes ``None``)."""
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.keys: List[str] = []
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+            self.keys.append(search_key(value))
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code] if code >= 0 else None
+
+    def containing(self, needle: str) -> "np.ndarray":
+        """Codes of values whose search key contains the already-normalized ``needle``."""
+        return np.fromiter((code for code, key in enumerate(self.keys) if needle in key), dtype=np.int32)
+
+
+class ColumnarProviderRepository(ProviderRepository):
+    """Read-only provider catalog held in NumPy columns instead of nested ``Event`` models.
+
+    Events are sorted by start time once at build time. Start times, dictionary codes for
+    league/venue/team and the listing fields live in flat arrays; ids, titles and URLs use
+    NumPy's variable-width string dtype, and normalized titles are joined into one string
+    that a query scans with a single regex pass. A search bisects the date window, evaluates
+    filters as boolean masks over growing blocks (stopping once ``limit`` rows matched) and
+    builds pydantic ``Event`` objects only for the returned rows. Matching follows
+    ``common.matching.event_matches``: substrings over the same normalized search keys, with
+    the same trigram spelling correction as ``InMemoryProviderRepository`` on a miss.
+
+    Requires numpy >= 2.0. Timestamps are returned in UTC.
+    """
+
+    first_block_size = 4_096
+    block_size = 65_536
+
+    def __init__(
+        self,
+        events: Iterable[Event],
+        provider_id: str = "columnar-catalog",
+        fuzzy_threshold: Optional[float] = 0.5,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("ColumnarProviderRepository requires numpy>=2.0 (pip install numpy).")
+        self.provider_id = provider_id
+        self._leagues = _Dictionary()
+        self._venues = _Dictionary()
+        self._teams = _Dictionary()
+        self._providers = _Dictionary()
+        self._sections = _Dictionary()
+        self._rows = _Dictionary()
+        self._seats = _Dictionary()
+        self._notes = _Dictionary()
+        self._build(sorted(events, key=lambda event: _epoch_us(event.start_at)))
+        self._fuzzy = FuzzyTermResolver(fuzzy_threshold) if fuzzy_threshold else None
+        if self._fuzzy is not None:
+            self._fuzzy.add(self._teams.keys, self._leagues.keys + self._venues.keys)
+
+    def __len__(self) -> int:
+        return len(self._start_us)
+
+    def _build(self, events: List[Event]) -> None:
+        start_us, league, venue = array("q"), array("i"), array("i")
+        team_offsets, team_codes = array("q", [0]), array("i")
+        listing_offsets, listing_provider, price = array("q", [0]), array("i"), array("d")
+        currency, is_best, fetched_us = array("b"), array("b"), array("q")
+        section, row, seat, notes = array("i"), array("i"), array("i"), array("i")
+        event_ids: List[str] = []
+        titles: List[str] = []
+        listing_ids: List[str] = []
+        urls: List[str] = []
+
+        for event in events:
+            start_us.append(_epoch_us(event.start_at))
+            event_ids.append(event.event_id)
+            titles.append(event.title)
+            league.append(self._leagues.encode(event.league))
+            venue.append(self._venues.encode(event.venue))
+            team_codes.extend(self._teams.encode(team) for team in event.teams)
+            team_offsets.append(len(team_codes))
+            for listing in event.listings:
+                listing_ids.append(listing.listing_id)
+                urls.append(str(listing.url))
+                listing_provider.append(self._providers.encode(listing.provider))
+                price.append(listing.price.amount)
+                currency.append(_CURRENCIES.index(listing.price.currency))
+                section.append(self._sections.encode(listing.seat.section))
+                row.append(self._rows.encode(listing.seat.row))
+                seat.append(self._seats.encode(listing.seat.seat))
+                notes.append(self._notes.encode(listing.seat.notes))
+                is_best.append(listing.is_best_price)
+                fetched_us.append(_epoch_us(listing.fetched_at))
+            listing_offsets.append(len(listing_ids))
+
+        strings = StringDType()
+        self._start_us = np.array(start_us, dtype=np.int64)
+        self._event_ids = np.array(event_ids, dtype=strings)
+        self._titles = np.array(titles, dtype=strings)
+        title_keys = [search_key(title) for title in titles]
+        # Row ``i`` occupies ``[_title_starts[i], _title_starts[i + 1] - 1)``; NUL separates titles.
+        self._title_text = "\0".join(title_keys) + "\0"
+        self._title_starts = np.zeros(len(title_keys) + 1, dtype=np.int64)
+        np.cumsum([len(title) + 1 for title in title_keys], out=self._title_starts[1:])
+        self._league = np.array(league, dtype=np.int32)
+        self._venue = np.array(venue, dtype=np.int32)
+        self._team_offsets = np.array(team_offsets, dtype=np.int64)
+        self._team_codes = np.array(team_codes, dtype=np.int32)
+        self._team_owner = np.repeat(np.arange(len(events), dtype=np.int32), np.diff(self._team_offsets))
+        self._listing_offsets = np.array(listing_offsets, dtype=np.int64)
+        self._listing_ids = np.array(listing_ids, dtype=strings)
+        self._urls = np.array(urls, dtype=strings)
+        self._listing_provider = np.array(listing_provider, dtype=np.int32)
+        self._price = np.array(price, dtype=np.float64)
+        self._currency = np.array(currency, dtype=np.int8)
+        self._section = np.array(section, dtype=np.int32)
+        self._row = np.array(row, dtype=np.int32)
+        self._seat = np.array(seat, dtype=np.int32)
+        self._note = np.array(notes, dtype=np.int32)
+        self._is_best = np.array(is_best, dtype=np.bool_)
+        self._fetched_us = np.array(fetched_us, dtype=np.int64)
+
+    async def search(self, request: SearchRequest) -> List[Event]:
+        return self.find(request)
+
+    def find(self, request: SearchRequest) -> List[Event]:
+        """Synchronous search over the columns, retrying with corrected spellings on a miss."""
+        filters = request.filters
+        lo = np.searchsorted(self._start_us, _epoch_us(filters.date_from), "left") if filters.date_from else 0
+        hi = np.searchsorted(self._start_us, _epoch_us(filters.date_to), "right") if filters.date_to else len(self)
+
+        terms = SearchTerms.from_request(request)
+        rows = self._find_rows(terms, int(lo), int(hi), request.limit)
+        if not len(rows) and self._fuzzy is not None and (corrected := self._fuzzy.resolve(terms)) is not None:
+            rows = self._find_rows(corrected, int(lo), int(hi), request.limit)
+        return self._materialize(rows)
+
+    def _find_rows(self, terms: SearchTerms, start: int, stop: int, limit: int) -> "np.ndarray":
+        matched: List["np.ndarray"] = [np.empty(0, dtype=np.int64)]
+        remaining = limit
+        size = min(self.first_block_size, self.block_size)
+        while start < stop and remaining > 0:
+            rows = self._match_block(start, min(start + size, stop), terms)[:remaining]
+            matched.append(rows)
+            remaining -= len(rows)
+            start += size
+            size = min(size * 2, self.block_size)
+        return np.concatenate(matched)
+
+    def _match_block(self, lo: int, hi: int, terms: SearchTerms) -> "np.ndarray":
+        """Return positions in ``[lo, hi)`` satisfying the text terms, in start-time order."""
+        mask = np.ones(hi - lo, dtype=np.bool_)
+        if terms.league is not None:
+            mask &= np.isin(self._league[lo:hi], self._leagues.containing(terms.league))
+        if terms.location is not None:
+            mask &= np.isin(self._venue[lo:hi], self._venues.containing(terms.location))
+        if terms.team is not None:
+            mask &= self._has_team(self._teams.containing(terms.team), lo, hi)
+        rows = np.flatnonzero(mask) + lo
+        if terms.query is None or not len(rows):
+            return rows
+
+        query = terms.query
+        # Dictionary columns resolve against their small vocabularies.
+        hits = np.isin(self._league[rows], self._leagues.containing(query))
+        hits |= np.isin(self._venue[rows], self._venues.containing(query))
+        hits |= self._has_team(self._teams.containing(query), lo, hi)[rows - lo]
+        hits |= self._title_contains(query, lo, hi)[rows - lo]
+        return rows[hits]
+
+    def _title_contains(self, query: str, lo: int, hi: int) -> "np.ndarray":
+        """Boolean mask over ``[lo, hi)`` marking titles that contain ``query``."""
+        mask = np.zeros(hi - lo, dtype=np.bool_)
+        if "\0" in query:
+            return mask
+        pattern = re.compile(re.escape(query))
+        positions = np.fromiter(
+            (match.start() for match in pattern.finditer(self._title_text, self._title_starts[lo], self._title_starts[hi])),
+            dtype=np.int64,
+        )
+        mask[np.searchsorted(self._title_starts, positions, "right") - 1 - lo] = True
+        return mask
+
+    def _has_team(self, codes: "np.ndarray", lo: int, hi: int) -> "np.ndarray":
+        """Boolean mask over ``[lo, hi)`` marking events with a team in ``codes``."""
+        mask = np.zeros(hi - lo, dtype=np.bool_)
+        if not len(codes):
+            return mask
+        first, last = self._team_offsets[lo], self._team_offsets[hi]
+        hits = np.isin(self._team_codes[first:last], codes)
+        mask[self._team_owner[first:last][hits] - lo] = True
+        return mask
+
+    def _materialize(self, rows: "np.ndarray") -> List[Event]:
+        payloads: List[Dict[str, Any]] = []
+        for row in rows.tolist():
+            first, last = self._team_offsets[row], self._team_offsets[row + 1]
+            payloads.append(
+                {
+                    "event_id": str(self._event_ids[row]),
+                    "title": str(self._titles[row]),
+                    "league": self._leagues.decode(int(self._league[row])),
+                    "venue": self._venues.decode(int(self._venue[row])),
+                    "start_at": _from_epoch_us(int(self._start_us[row])),
+                    "teams": [self._teams.decode(code) for code in self._team_codes[first:last].tolist()],
+                    "listings": self._listing_payloads(row),
+                }
+            )
+        return validate_events(payloads)
+
+    def _listing_payloads(self, row: int) -> List[Dict[str, Any]]:
+        payloads: List[Dict[str, Any]] = []
+        for idx in range(int(self._listing_offsets[row]), int(self._listing_offsets[row + 1])):
+            payloads.append(
+                {
+                    "listing_id": str(self._listing_ids[idx]),
+                    "provider": self._providers.decode(int(self._listing_provider[idx])),
+                    "url": str(self._urls[idx]),
+                    "price": {"amount": float(self._price[idx]), "currency": _CURRENCIES[self._currency[idx]]},
+                    "seat": {
+                        "section": self._sections.decode(int(self._section[idx])),
+                        "row": self._rows.decode(int(self._row[idx])),
+                        "seat": self._seats.decode(int(self._seat[idx])),
+                        "notes": self._notes.decode(int(self._note[idx])),
+                    },
+                    "is_best_price": bool(self._is_best[idx]),
+                    "fetched_at": _from_epoch_us(int(self._fetched_us[idx])),
+                }
+            )
+        return payloads
+
+    async def status(self) -> List[ProviderStatus]:
+        return [
+            ProviderStatus(
+                provider_id=self.provider_id,
+                status=ProviderHealth.HEALTHY,
+                last_success_at=datetime.now(timezone.utc),
+            )
+        ]
+
+    async def aclose(self) -> None:
+        return None
@@ -1,39 +1,208 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import List, Optional
+import asyncio
+import logging
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
 
+from bson import Binary
 from motor.motor_asyncio import AsyncIOMotorCollection
-
-from app.repositories import FavoritesRepository, SearchCacheRepository, UserProfileRepository
-from app.schemas import Event, Favorite, UserProfile
+from pydantic import ValidationError
+from pymongo.errors import OperationFailure
+
+from app.repositories import (
+    CachedSearch,
+    CacheFreshness,
+    FavoritesRepository,
+    SearchCacheRepository,
+    UserProfileRepository,
+    cache_freshness,
+)
+from app.schemas import Event, Favorite, SearchRequest, UserProfile
+from common.serialization import (
+    decode_search_response,
+    encode_search_response,
+    events_to_documents,
+    validate_events,
+)
+
+logger = logging.getLogger(__name__)
+
+# Server error code when create_index is called with different options for an existing index.
+_INDEX_OPTIONS_CONFLICT = 85
 
 
 class MongoSearchCacheRepository(SearchCacheRepository):
-    """Mongo-backed search cache for events."""
-
-    def __init__(self, collection: AsyncIOMotorCollection, ttl_seconds: int) -> None:
+    """Mongo-backed search cache for events.
+
+    Documents expire through a TTL index on ``created_at`` that also covers the stale windows;
+    since Mongo removes expired documents only periodically, reads check the age themselves.
+    Call ``ensure_indexes`` once at startup rather than per write.
+
+    With ``compressed`` set, entries are written as one zlib-compressed ``SearchResponse`` JSON
+    blob tagged with ``COMPRESSED_SCHEMA_VERSION`` instead of nested event documents; the
+    blob is both smaller on the wire and decoded in a single pydantic-core call. Reads accept
+    either layout, so the setting can be flipped without flushing the collection.
+
+    With a ``popularity_collection``, every lookup and write bumps a per-key hit counter kept
+    next to the request that produced the entry. Counters outlive the cache entries (they
+    expire ``popularity_window_seconds`` after a key was last seen) so cache warm-up can find
+    the most requested searches even once their results have expired.
+    """
+
+    COMPRESSED_SCHEMA_VERSION = 1
+    _PROJECTION = {"_id": 0, "created_at": 1, "limit": 1, "events": 1, "v": 1, "blob": 1}
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        ttl_seconds: int,
+        stale_while_revalidate_seconds: int = 0,
+        stale_if_error_seconds: int = 0,
+        compressed: bool = False,
+        compression_level: int = 6,
+        popularity_collection: Optional[AsyncIOMotorCollection] = None,
+        popularity_window_seconds: int = 7 * 24 * 3600,
+    ) -> None:
         self.collection = collection
         self.ttl_seconds = ttl_seconds
+        self.stale_while_revalidate_seconds = stale_while_revalidate_seconds
+        self.stale_if_error_seconds = stale_if_error_seconds
+        self.compressed = compressed
+        self.compression_level = compression_level
+        self.popularity_collection = popularity_collection
+        self.popularity_window_seconds = popularity_window_seconds
+
+    @property
+    def retention_seconds(self) -> int:
+        return self.ttl_seconds + max(self.stale_while_revalidate_seconds, self.stale_if_error_seconds)
+
+    async def ensure_indexes(self) -> None:
+        """Create the TTL (and popularity) indexes, updating expiries whose settings changed."""
+        await _ensure_ttl_index(self.collection, "created_at", self.retention_seconds)
+        if self.popularity_collection is not None:
+            await _ensure_ttl_index(self.popularity_collection, "last_seen_at", self.popularity_window_seconds)
+            await self.popularity_collection.create_index([("hits", -1)])
 
     async def get(self, key: str) -> Optional[List[Event]]:
-        doc = await self.collection.find_one({"_id": key})
+        cached = await self.lookup(key)
+        if cached is None or cached.freshness is not CacheFreshness.FRESH:
+            return None
+        return cached.events
+
+    async def lookup(self, key: str) -> Optional[CachedSearch]:
+        doc, _ = await asyncio.gather(self.collection.find_one({"_id": key}, self._PROJECTION), self._record_hit(key))
         if not doc:
             return None
-        # Convert stored dicts back to Event models
-        return [Event(**item) for item in doc["events"]]
-
-    async def set(self, key: str, events: List[Event]) -> None:
-        await self.collection.replace_one(
-            {"_id": key},
-            {
-                "_id": key,
-                "events": [event.model_dump() for event in events],
-                "created_at": datetime.now(timezone.utc),
-            },
-            upsert=True,
+        created_at = doc["created_at"]
+        if created_at.tzinfo is None:
+            # Mongo stores UTC; drivers hand back naive datetimes unless tz_aware is set.
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        age = (datetime.now(timezone.utc) - created_at).total_seconds()
+        freshness = cache_freshness(
+            age,
+            self.ttl_seconds,
+            self.stale_while_revalidate_seconds,
+            self.stale_if_error_seconds,
+        )
+        if freshness is None:
+            return None
+
+        body: Optional[bytes] = None
+        if "blob" in doc:
+            if doc.get("v") != self.COMPRESSED_SCHEMA_VERSION:
+                # Written by a newer/older release; treat as a miss and let the next write replace it.
+                return None
+            body = zlib.decompress(doc["blob"])
+            events = decode_search_response(body)
+        else:
+            # Convert stored dicts back to Event models in a single batch
+            events = validate_events(doc["events"])
+        return CachedSearch(
+            events=events,
+            freshness=freshness,
+            fresh_for_seconds=self.ttl_seconds - age,
+            body=body,
+            limit=doc.get("limit"),
+        )
+
+    async def popular_requests(self, limit: int) -> List[SearchRequest]:
+        """Return the requests behind the most frequently looked-up or written keys."""
+        if self.popularity_collection is None:
+            return []
+        cursor = (
+            self.popularity_collection.find({"request": {"$exists": True}}, {"_id": 0, "request": 1})
+            .sort("hits", -1)
+            .limit(limit)
+        )
+        requests: List[SearchRequest] = []
+        for doc in await cursor.to_list(length=limit):
+            try:
+                requests.append(SearchRequest.model_validate(doc["request"]))
+            except ValidationError:
+                continue
+        return requests
+
+    async def expiring_keys(self, keys: Sequence[str], within_seconds: float) -> Set[str]:
+        """Return the keys that are missing or stop being fresh within ``within_seconds``."""
+        cursor = self.collection.find({"_id": {"$in": list(keys)}}, {"_id": 1, "created_at": 1})
+        refresh_before = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds - within_seconds)
+        kept: Set[str] = set()
+        for doc in await cursor.to_list(length=len(keys)):
+            created_at = doc["created_at"]
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            if created_at > refresh_before:
+                kept.add(doc["_id"])
+        return set(keys) - kept
+
+    async def set(
+        self,
+        key: str,
+        events: List[Event],
+        body: Optional[bytes] = None,
+        limit: Optional[int] = None,
+        request: Optional[SearchRequest] = None,
+    ) -> None:
+        document = {"_id": key, "limit": limit, "created_at": datetime.now(timezone.utc)}
+        if self.compressed:
+            encoded = body if body is not None else encode_search_response(events)
+            document["v"] = self.COMPRESSED_SCHEMA_VERSION
+            document["blob"] = Binary(zlib.compress(encoded, self.compression_level))
+        else:
+            document["events"] = events_to_documents(events)
+        await asyncio.gather(
+            self.collection.replace_one({"_id": key}, document, upsert=True), self._record_hit(key, request)
+        )
+
+    async def _record_hit(self, key: str, request: Optional[SearchRequest] = None) -> None:
+        if self.popularity_collection is None:
+            return
+        update: Dict[str, Any] = {"$inc": {"hits": 1}, "$set": {"last_seen_at": datetime.now(timezone.utc)}}
+        if request is not None:
+            update["$set"]["request"] = request.model_dump(mode="json", exclude_defaults=True)
+        try:
+            # Only writes carry the request, so only they may create the counter document.
+            await self.popularity_collection.update_one({"_id": key}, update, upsert=request is not None)
+        except Exception:
+            logger.warning("Failed to record search popularity for %s", key, exc_info=True)
+
+    async def aclose(self) -> None:
+        return None
+
+
+async def _ensure_ttl_index(collection: AsyncIOMotorCollection, field: str, expire_after_seconds: int) -> None:
+    try:
+        await collection.create_index(field, expireAfterSeconds=expire_after_seconds)
+    except OperationFailure as exc:
+        if exc.code != _INDEX_OPTIONS_CONFLICT:
+            raise
+        await collection.database.command(
+            "collMod",
+            collection.name,
+            index={"keyPattern": {field: 1}, "expireAfterSeconds": expire_after_seconds},
         )
-        await self.collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
 
 
 class MongoUserProfileRepository(UserProfileRepository, FavoritesRepository):
@@ -65,6 +234,16 @@ class MongoUserProfileRepository(UserProfileRepository, FavoritesRepository):
         await self.upsert(profile)
         return favorite
 
+    async def popular(self, limit: int) -> List[Favorite]:
+        pipeline = [
+            {"$unwind": "$favorites"},
+            {"$group": {"_id": {"type": "$favorites.type", "name": "$favorites.name"}, "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": limit},
+        ]
+        docs = await self.collection.aggregate(pipeline).to_list(length=limit)
+        return [Favorite(type=doc["_id"]["type"], name=doc["_id"]["name"]) for doc in docs]
+
     async def delete_favorite(self, user_id: str, favorite: Favorite) -> None:
         profile = await self.get(user_id)
         if not profile:
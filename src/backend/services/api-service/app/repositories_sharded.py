@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+from app.repositories import InMemoryProviderRepository, ProviderRepository
+from app.schemas import Event, ProviderHealth, ProviderStatus, SearchRequest
+from common.matching import EventKeys, FuzzyTermResolver, SearchTerms
+from common.normalization import merge_events, sort_events
+
+logger = logging.getLogger(__name__)
+
+# Each shard process holds exactly one catalog partition, built once by the pool initializer.
+_shard: Optional[InMemoryProviderRepository] = None
+
+
+def _load_shard(events: List[Event]) -> None:
+    global _shard
+    # Spelling correction is resolved in the parent against the whole catalog, not per shard.
+    _shard = InMemoryProviderRepository(events=events, fuzzy_threshold=None)
+
+
+def _shard_size() -> int:
+    if _shard is None:
+        raise RuntimeError("Shard process was started without its catalog.")
+    return len(_shard)
+
+
+def _search_shard(terms: SearchTerms, request: SearchRequest) -> List[str]:
+    if _shard is None:
+        raise RuntimeError("Shard process was started without its catalog.")
+    return [event.event_id for event in _shard.find_terms(terms, request)]
+
+
+class ShardedProviderRepository(ProviderRepository):
+    """In-memory catalog partitioned across worker processes, searched in parallel.
+
+    Events are split round-robin into ``shards`` partitions. Each partition is sent once to
+    its own single-process pool, whose initializer indexes it with
+    ``InMemoryProviderRepository``; a search then only ships the request out and at most
+    ``limit`` event ids back per shard, resolved against the parent's copy of the catalog.
+    Shard results are k-way merged by start time, and the event loop only awaits futures, so
+    CPU-bound filtering never blocks other requests.
+    When no shard finds an exact match, misspelled words are corrected once in the parent,
+    against the words of the whole catalog, and the corrected terms are sent to every shard.
+    """
+
+    def __init__(
+        self,
+        events: Sequence[Event],
+        shards: int,
+        provider_id: str = "sharded-catalog",
+        fuzzy_threshold: Optional[float] = 0.5,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.provider_id = provider_id
+        self._events: Dict[str, Event] = {event.event_id: event for event in events}
+        self._fuzzy = FuzzyTermResolver(fuzzy_threshold) if fuzzy_threshold else None
+        if self._fuzzy is not None:
+            for event in self._events.values():
+                keys = EventKeys.from_event(event)
+                self._fuzzy.add([keys.teams], [keys.league, keys.venue])
+        # Partition the deduplicated catalog so one event_id never lives in two shards.
+        catalog = list(self._events.values())
+        # "spawn" keeps worker start-up independent of the parent's threads and event loop.
+        context = multiprocessing.get_context("spawn")
+        self._pools = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=_load_shard,
+                initargs=(catalog[shard::shards],),
+            )
+            for shard in range(shards)
+        ]
+
+    async def start(self) -> None:
+        """Spawn every shard process and wait until its partition is indexed.
+
+        Pools start their worker lazily; without this the first searches would pay for the
+        spawn and the indexing, and run past the composite's per-provider timeout.
+        """
+        loop = asyncio.get_running_loop()
+        sizes = await asyncio.gather(*(loop.run_in_executor(pool, _shard_size) for pool in self._pools))
+        logger.info("Sharded catalog %s indexed %d events in %d shards", self.provider_id, sum(sizes), len(sizes))
+
+    async def search(self, request: SearchRequest) -> List[Event]:
+        terms = SearchTerms.from_request(request)
+        merged = await self._search(terms, request)
+        if not merged and self._fuzzy is not None:
+            corrected = self._fuzzy.resolve(terms)
+            if corrected is not None:
+                merged = await self._search(corrected, request)
+        return merged
+
+    async def _search(self, terms: SearchTerms, request: SearchRequest) -> List[Event]:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(pool, _search_shard, terms, request) for pool in self._pools)
+        )
+        streams = [sort_events([self._events[event_id] for event_id in event_ids]) for event_ids in results]
+        return merge_events(streams, request.limit)
+
+    async def status(self) -> List[ProviderStatus]:
+        return [
+            ProviderStatus(
+                provider_id=self.provider_id,
+                status=ProviderHealth.HEALTHY,
+                last_success_at=datetime.now(timezone.utc),
+            )
+        ]
+
+    async def aclose(self) -> None:
+        pools, self._pools = self._pools, []
+        for pool in pools:
+            await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
@@ -55,9 +55,14 @@ async def get_ticket_games(
 async def search_events(
     request: SearchRequest,
     search_service: SearchService = Depends(get_search_service),
-) -> SearchResponse:
-    """Entry point for event search; backed by provider repository + cache."""
-    return await search_service.search(request)
+) -> Response:
+    """Entry point for event search; backed by provider repository + cache.
+
+    The body is sent as pre-encoded bytes (cached on hits), skipping ``response_model``
+    re-validation and serialization; ``response_model`` still documents the schema.
+    """
+    body = await search_service.search_json(request)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
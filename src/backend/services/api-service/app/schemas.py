@@ -139,12 +139,27 @@ class ProviderHealth(str, Enum):
     DOWN = "down"
 
 
+class RateLimitState(BaseModel):
+    tokens_available: float = Field(..., ge=0)
+    queued: int = Field(..., ge=0)
+    max_queue: int = Field(..., ge=0)
+    rejected_total: int = Field(default=0, ge=0)
+    saturated: bool = False
+
+
 class ProviderStatus(BaseModel):
     provider_id: str = Field(..., min_length=2, max_length=64)
     status: ProviderHealth = ProviderHealth.HEALTHY
     last_success_at: Optional[datetime] = None
     last_error: Optional[str] = Field(default=None, max_length=256)
     latency_ms: Optional[int] = Field(default=None, ge=0)
+    latency_p50_ms: Optional[float] = Field(default=None, ge=0)
+    latency_p95_ms: Optional[float] = Field(default=None, ge=0)
+    latency_p99_ms: Optional[float] = Field(default=None, ge=0)
+    success_count: int = Field(default=0, ge=0)
+    error_count: int = Field(default=0, ge=0)
+    timeout_count: int = Field(default=0, ge=0)
+    rate_limit: Optional[RateLimitState] = None
 
 
 class ProviderStatusResponse(BaseModel):
@@ -1,16 +1,38 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import json
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional, Set
 
-from app.repositories import ProviderRepository, SearchCacheRepository, UserProfileRepository
-from app.schemas import ProviderStatus, SearchRequest, SearchResponse, UserContext, UserProfile
+from app.repositories import (
+    CachedSearch,
+    CacheFreshness,
+    FavoritesRepository,
+    ProviderRepository,
+    SearchCacheRepository,
+    UserProfileRepository,
+)
+from app.schemas import (
+    FavoriteType,
+    ProviderStatus,
+    SearchFilters,
+    SearchRequest,
+    SearchResponse,
+    UserContext,
+    UserProfile,
+)
+from common.concurrency import SingleFlight
 from common.errors import BadRequestError, NotFoundError
+from common.resilience import ProviderError
+from common.matching import SearchTerms
 from common.pricing import mark_best_prices
 from common.normalization import normalize_events
+from common.serialization import encode_search_response
 from app.endpoints.get_game_tickets import render_prompt
 
+logger = logging.getLogger(__name__)
+
 
 class SearchService:
     """Coordinates search queries across providers and cache."""
@@ -22,37 +44,184 @@ class SearchService:
     ) -> None:
         self.provider_repository = provider_repository
         self.cache_repository = cache_repository
+        # Concurrent misses for the same key share one provider fetch instead of each calling out.
+        self._flights: SingleFlight[CachedSearch] = SingleFlight()
+        # Strong references keep background refreshes of stale entries from being collected.
+        self._refreshes: Set["asyncio.Future[CachedSearch]"] = set()
 
     async def search(self, request: SearchRequest) -> SearchResponse:
+        result = await self._search(request)
+        return SearchResponse.from_events(result.events)
+
+    async def search_json(self, request: SearchRequest) -> bytes:
+        """Return the encoded ``SearchResponse`` body, reusing the cached bytes on a hit."""
+        result = await self._search(request)
+        return result.body if result.body is not None else encode_search_response(result.events)
+
+    async def _search(self, request: SearchRequest) -> CachedSearch:
         if request.limit <= 0:
             raise BadRequestError("Limit must be a positive integer")
 
-        cache_key = self._cache_key(request) if self.cache_repository else None
-        if cache_key and self.cache_repository:
-            cached = await self.cache_repository.get(cache_key)
+        cache_key = self._cache_key(request)
+        cached: Optional[CachedSearch] = None
+        fetch_limit = request.limit
+        if self.cache_repository is not None:
+            cached = await self.cache_repository.lookup(cache_key)
+            if cached is not None and cached.covers(request.limit):
+                if cached.freshness is CacheFreshness.FRESH:
+                    return cached.sliced(request.limit)
+                if cached.freshness is CacheFreshness.STALE:
+                    self._revalidate(cache_key, request, max(request.limit, cached.limit or 0))
+                    return cached.sliced(request.limit)
             if cached is not None:
-                return SearchResponse.from_events(cached)
+                # Never replace a cached superset with a smaller fetch.
+                fetch_limit = max(request.limit, cached.limit or 0)
+
+        try:
+            result = await self._fetch_once(cache_key, request, fetch_limit)
+        except ProviderError:
+            if cached is not None:
+                logger.warning("All providers failed; serving stale results for %s", cache_key)
+                return cached.sliced(request.limit)
+            logger.warning("All providers failed; returning no results for %s", cache_key)
+            return CachedSearch(events=[], freshness=CacheFreshness.FRESH)
+        return result.sliced(request.limit)
+
+    async def _fetch_once(self, cache_key: str, request: SearchRequest, limit: int) -> CachedSearch:
+        # Flights are per fetch limit: a caller asking for more must not receive a smaller result.
+        if limit != request.limit:
+            request = request.model_copy(update={"limit": limit})
+        return await self._flights.do(f"{cache_key}:{limit}", lambda: self._fetch(cache_key, request))
 
+    async def _fetch(self, cache_key: str, request: SearchRequest) -> CachedSearch:
         events = await self.provider_repository.search(request)
         mark_best_prices(events)
         events = normalize_events(events)
 
-        if cache_key and self.cache_repository:
-            await self.cache_repository.set(cache_key, events)
+        body: Optional[bytes] = None
+        if self.cache_repository is not None:
+            body = encode_search_response(events)
+            await self.cache_repository.set(cache_key, events, body=body, limit=request.limit, request=request)
+        return CachedSearch(events=events, freshness=CacheFreshness.FRESH, body=body, limit=request.limit)
 
-        return SearchResponse.from_events(events)
+    async def refresh(self, request: SearchRequest) -> None:
+        """Fetch from providers and rewrite the cache entry, even when a fresh one exists."""
+        if request.limit <= 0:
+            raise BadRequestError("Limit must be a positive integer")
+        await self._fetch_once(self._cache_key(request), request, request.limit)
+
+    def _revalidate(self, cache_key: str, request: SearchRequest, limit: int) -> None:
+        """Refresh a stale entry in the background; at most one refresh per key runs at a time."""
+        if f"{cache_key}:{limit}" in self._flights:
+            return
+        task = asyncio.ensure_future(self._fetch_once(cache_key, request, limit))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: "asyncio.Future[CachedSearch]") -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh of a stale search failed", exc_info=task.exception())
 
     async def providers_status(self) -> List[ProviderStatus]:
         return await self.provider_repository.status()
 
     @staticmethod
     def _cache_key(request: SearchRequest) -> str:
-        serialized = json.dumps(
-            request.model_dump(mode="json"),
-            sort_keys=True,
-            default=str,
-        )
-        return f"search:{hashlib.sha1(serialized.encode('utf-8')).hexdigest()}"
+        # Key on normalized terms so equivalent spellings ("Atlético"/"atletico") share an entry;
+        # a 128-bit digest keeps keys short and collision-safe in the shared Mongo cache. The
+        # limit is left out: one entry holds the largest result set and smaller limits slice it.
+        canonical = SearchTerms.from_request(request).fingerprint()
+        return f"search:{hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()}"
+
+
+class CacheWarmer:
+    """Pre-fills the search cache at startup so the first users of a new instance get hits.
+
+    Candidates are the most popular searches the cache has counted (Mongo keeps per-key hit
+    counters) and the most popular favorite teams/leagues. Only candidates whose shared entry
+    is missing or stops being fresh within ``refresh_within_seconds`` are re-fetched, at most
+    ``concurrency`` at a time; entries still fresh in the shared cache reach this instance on
+    first use anyway. The default in-memory cache and profile store start empty, so there is
+    nothing to warm there. ``ready`` turns True once warm-up finishes, fails or exceeds
+    ``timeout_seconds``.
+    """
+
+    def __init__(
+        self,
+        search_service: SearchService,
+        favorites_repository: Optional[FavoritesRepository] = None,
+        top_queries: int = 50,
+        top_favorites: int = 50,
+        concurrency: int = 4,
+        timeout_seconds: float = 30.0,
+        refresh_within_seconds: float = 30.0,
+    ) -> None:
+        self.search_service = search_service
+        self.favorites_repository = favorites_repository
+        self.top_queries = top_queries
+        self.top_favorites = top_favorites
+        self.concurrency = concurrency
+        self.timeout_seconds = timeout_seconds
+        self.refresh_within_seconds = refresh_within_seconds
+        self.ready = False
+        self.warmed = 0
+
+    async def run(self) -> int:
+        """Warm the cache and return how many searches were precomputed."""
+        try:
+            await asyncio.wait_for(self._warm_all(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning("Search cache warm-up timed out after %ss", self.timeout_seconds)
+        except Exception:
+            logger.warning("Search cache warm-up failed", exc_info=True)
+        finally:
+            self.ready = True
+        logger.info("Search cache warm-up precomputed %d searches", self.warmed)
+        return self.warmed
+
+    async def _warm_all(self) -> None:
+        if self.search_service.cache_repository is None:
+            return
+        requests = await self._requests()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(request: SearchRequest) -> None:
+            async with semaphore:
+                try:
+                    await self.search_service.refresh(request)
+                except Exception:
+                    logger.warning("Warm-up search failed", exc_info=True)
+                    return
+                self.warmed += 1
+
+        await asyncio.gather(*(warm(request) for request in requests))
+
+    async def _requests(self) -> List[SearchRequest]:
+        cache = self.search_service.cache_repository
+        candidates: List[SearchRequest] = []
+        popular_requests = getattr(cache, "popular_requests", None)
+        if popular_requests is not None and self.top_queries:
+            candidates.extend(await popular_requests(self.top_queries))
+        if self.favorites_repository is not None and self.top_favorites:
+            for favorite in await self.favorites_repository.popular(self.top_favorites):
+                if favorite.type is FavoriteType.TEAM:
+                    filters = SearchFilters(team=favorite.name)
+                else:
+                    filters = SearchFilters(league=favorite.name)
+                candidates.append(SearchRequest(filters=filters))
+
+        # One search per cache entry, at the largest limit asked for (smaller limits slice it).
+        by_key: Dict[str, SearchRequest] = {}
+        for request in candidates:
+            key = self.search_service._cache_key(request)
+            if key not in by_key or request.limit > by_key[key].limit:
+                by_key[key] = request
+        expiring_keys = getattr(cache, "expiring_keys", None)
+        if expiring_keys is None or not by_key:
+            return list(by_key.values())
+        due = await expiring_keys(list(by_key), self.refresh_within_seconds)
+        return [request for key, request in by_key.items() if key in due]
 
 
 class TicketFinderService:
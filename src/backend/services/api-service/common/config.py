@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import Field, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -18,11 +18,104 @@ class AppSettings(BaseSettings):
         ]
     )
     search_cache_ttl_seconds: int = Field(default=120, ge=0)
+    search_cache_max_entries: int = Field(default=10_000, ge=1, description="Search results kept by the in-memory cache")
+    search_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, ge=0, description="Approximate JSON size budget of the in-memory cache (0: no limit)"
+    )
+    search_cache_sweep_interval_seconds: float = Field(
+        default=30.0, gt=0, description="How often the in-memory cache drops expired entries"
+    )
+    search_cache_stale_while_revalidate_seconds: int = Field(
+        default=0, ge=0, description="Serve expired results this long past the TTL while one refresh runs"
+    )
+    search_cache_stale_if_error_seconds: int = Field(
+        default=0, ge=0, description="Serve expired results this long past the TTL when every provider fails"
+    )
+    search_cache_mongo_compressed: bool = Field(
+        default=False, description="Store Mongo cache entries as compressed JSON blobs instead of documents"
+    )
+    search_warmup_top_queries: int = Field(
+        default=50, ge=0, description="Most requested searches (Mongo popularity counters) refreshed at startup"
+    )
+    search_warmup_top_favorites: int = Field(
+        default=50, ge=0, description="Most popular favorite teams/leagues precomputed at startup"
+    )
+    search_warmup_concurrency: int = Field(default=4, ge=1, description="Warm-up searches run at the same time")
+    search_warmup_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="Report readiness after this long even if warm-up is unfinished"
+    )
+    search_warmup_refresh_within_seconds: float = Field(
+        default=30.0, ge=0, description="Warm-up re-fetches entries missing from Mongo or expiring within this window"
+    )
+    search_popularity_window_seconds: int = Field(
+        default=7 * 24 * 3600, ge=1, description="Keep a search's popularity counter this long after it was last seen"
+    )
+    search_cache_l1_ttl_seconds: int = Field(
+        default=10, ge=0, description="TTL of the in-process cache layered in front of the Mongo cache (0: no L1)"
+    )
+    search_cache_l1_max_entries: int = Field(
+        default=1_000, ge=1, description="Search results kept by the in-process L1 in front of the Mongo cache"
+    )
+    provider_search_timeout_seconds: float = Field(
+        default=4.0, gt=0, description="Global deadline for a provider fan-out during /search"
+    )
+    provider_timeout_seconds: float = Field(
+        default=3.0, gt=0, description="Per-provider timeout inside a search fan-out"
+    )
     enable_stub_data: bool = Field(default=True, description="Enable in-memory provider stub data")
+    stub_catalog_backend: Literal["indexed", "columnar", "sharded"] = Field(
+        default="indexed",
+        description="Storage for the stub catalog: token indexes, NumPy columns (requires numpy) or indexed shards in worker processes",
+    )
+    stub_catalog_shards: int = Field(default=2, ge=1, description="Worker processes for the sharded stub catalog")
+    stub_catalog_fuzzy_threshold: float = Field(
+        default=0.5,
+        ge=0,
+        le=1,
+        description="Trigram similarity for correcting misspelled query/team words when a search finds nothing (0 disables)",
+    )
     enable_stub_http_provider: bool = Field(default=False, description="Enable HTTP-based provider stub")
     stub_provider_base_url: Optional[HttpUrl] = Field(
         default=None, description="Base URL for HTTP provider stub (if enabled)"
     )
+    provider_max_connections: int = Field(default=100, ge=1, description="Connection pool size per HTTP provider")
+    provider_max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Idle keep-alive connections retained per HTTP provider"
+    )
+    provider_keepalive_expiry_seconds: float = Field(
+        default=30.0, ge=0, description="Idle time before a pooled provider connection is closed"
+    )
+    provider_http2: bool = Field(default=False, description="Negotiate HTTP/2 with providers (requires the h2 package)")
+    provider_max_retries: int = Field(default=2, ge=0, description="Retries for idempotent provider GETs")
+    provider_retry_backoff_base_seconds: float = Field(default=0.1, ge=0, description="Base delay for jittered backoff")
+    provider_retry_backoff_max_seconds: float = Field(default=1.0, ge=0, description="Upper bound for backoff delays")
+    provider_circuit_failure_threshold: int = Field(
+        default=5, ge=1, description="Consecutive failures before a provider circuit opens"
+    )
+    provider_circuit_reset_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="Time an open provider circuit waits before a half-open probe"
+    )
+    provider_hedge_enabled: bool = Field(default=False, description="Send hedged requests to slow providers")
+    provider_hedge_percentile: float = Field(
+        default=95.0, gt=0, le=100, description="Observed latency percentile after which a hedge is sent"
+    )
+    provider_hedge_budget_ratio: float = Field(
+        default=0.1, ge=0, lt=1, description="Maximum hedged requests as a fraction of primary requests"
+    )
+    provider_stream_events: bool = Field(
+        default=False, description="Decode provider event arrays incrementally and stop reading at the search limit"
+    )
+    provider_max_pages: int = Field(default=5, ge=1, description="Maximum provider result pages followed per search")
+    provider_rate_limit_per_second: Optional[float] = Field(
+        default=None, gt=0, description="Sustained requests/sec per HTTP provider (unset disables limiting)"
+    )
+    provider_rate_limit_burst: int = Field(default=10, ge=1, description="Token bucket burst size per provider")
+    provider_rate_limit_max_queue: int = Field(
+        default=50, ge=0, description="Searches allowed to wait for a provider rate-limit slot"
+    )
+    provider_rate_limit_max_wait_seconds: float = Field(
+        default=1.0, ge=0, description="Longest a search waits for a provider rate-limit slot"
+    )
     auth_demo_token: str = Field(default="demo-token", description="Temporary token for stub auth")
     jwt_secret: Optional[str] = Field(default=None, description="HS256 secret for JWT validation")
     jwt_issuer: Optional[str] = Field(default=None, description="Expected JWT issuer")
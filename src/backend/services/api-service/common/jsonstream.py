@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStream:
+    """Incrementally decode the items of a JSON array from text chunks.
+
+    Items are yielded as soon as they are complete, so callers can stop reading (and close
+    the underlying response) once they have what they need instead of buffering the body.
+    With ``items_key`` the array is read from that key of a top-level envelope object; the
+    envelope's other top-level values are collected into ``metadata`` as they are passed.
+    """
+
+    def __init__(self, chunks: AsyncIterable[str], items_key: Optional[str] = None) -> None:
+        self.items_key = items_key
+        self.metadata: Dict[str, Any] = {}
+        self._chunks = chunks.__aiter__()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        if self.items_key is None:
+            return self._array_items()
+        return self._envelope_items()
+
+    async def _envelope_items(self) -> AsyncIterator[Any]:
+        if await self._peek() != "{":
+            raise ValueError("Expected a JSON object")
+        self._pos += 1
+        if await self._peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = await self._decode_value()
+            if await self._peek() != ":":
+                raise ValueError("Expected ':' after object key")
+            self._pos += 1
+            if key == self.items_key:
+                async for item in self._array_items():
+                    yield item
+            else:
+                self.metadata[key] = await self._decode_value()
+            if await self._expect_separator("}"):
+                return
+
+    async def _array_items(self) -> AsyncIterator[Any]:
+        if await self._peek() != "[":
+            raise ValueError("Expected a JSON array")
+        self._pos += 1
+        if await self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield await self._decode_value()
+            if await self._expect_separator("]"):
+                return
+
+    async def _expect_separator(self, closing: str) -> bool:
+        """Consume a ``,`` or the closing bracket; return True when the container ended."""
+        separator = await self._peek()
+        if separator is None:
+            raise ValueError("Unterminated JSON container")
+        self._pos += 1
+        if separator == closing:
+            return True
+        if separator != ",":
+            raise ValueError(f"Unexpected character {separator!r} in JSON container")
+        return False
+
+    async def _decode_value(self) -> Any:
+        await self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if await self._fill():
+                    continue
+                raise
+            # A number or literal ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self._buffer) and await self._fill():
+                continue
+            self._pos = end
+            return value
+
+    async def _peek(self) -> Optional[str]:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                return None
+
+    async def _fill(self) -> bool:
+        if self._eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Iterable, List, Optional
+
+from app.schemas import Event, SearchRequest
+from common.search_index import TrigramIndex, utc_timestamp
+from common.text import search_key
+
+# Separates field values inside one key so a term never matches across two of them.
+_SEPARATOR = "\0"
+
+
+@dataclass(frozen=True)
+class EventKeys:
+    """Normalized match keys for an event, computed once when it enters a provider."""
+
+    text: str
+    teams: str
+    league: str
+    venue: str
+    start: float
+
+    @classmethod
+    def from_event(cls, event: Event) -> "EventKeys":
+        teams = _SEPARATOR.join(search_key(team) for team in event.teams)
+        league = search_key(event.league)
+        venue = search_key(event.venue)
+        return cls(
+            text=_SEPARATOR.join((search_key(event.title), league, venue, teams)),
+            teams=teams,
+            league=league,
+            venue=venue,
+            start=utc_timestamp(event.start_at),
+        )
+
+
+@dataclass(frozen=True)
+class SearchTerms:
+    """Normalized query and filters of a request, computed once per search."""
+
+    query: Optional[str] = None
+    team: Optional[str] = None
+    league: Optional[str] = None
+    location: Optional[str] = None
+    date_from: Optional[float] = None
+    date_to: Optional[float] = None
+
+    @classmethod
+    def from_request(cls, request: SearchRequest) -> "SearchTerms":
+        filters = request.filters
+        return cls(
+            query=search_key(request.query) if request.query else None,
+            team=search_key(filters.team) if filters.team else None,
+            league=search_key(filters.league) if filters.league else None,
+            location=search_key(filters.location) if filters.location else None,
+            date_from=utc_timestamp(filters.date_from) if filters.date_from else None,
+            date_to=utc_timestamp(filters.date_to) if filters.date_to else None,
+        )
+
+    def fingerprint(self) -> str:
+        """Canonical string for these terms; requests with equal terms get equal fingerprints.
+
+        Text fields are normalized keys (no ``|`` can occur) and dates are exact UTC timestamps,
+        so the same window written with different offsets maps to the same fingerprint.
+        """
+        return "|".join(
+            (
+                self.query or "",
+                self.team or "",
+                self.league or "",
+                self.location or "",
+                "" if self.date_from is None else repr(self.date_from),
+                "" if self.date_to is None else repr(self.date_to),
+            )
+        )
+
+
+def key_tokens(key: str) -> List[str]:
+    """Split a normalized key into its word tokens."""
+    return key.replace(_SEPARATOR, " ").split()
+
+
+def keys_match(keys: EventKeys, terms: SearchTerms) -> bool:
+    """Return True when precomputed event keys satisfy every normalized term."""
+    if terms.query is not None and terms.query not in keys.text:
+        return False
+    if terms.team is not None and terms.team not in keys.teams:
+        return False
+    if terms.league is not None and (not keys.league or terms.league not in keys.league):
+        return False
+    if terms.location is not None and (not keys.venue or terms.location not in keys.venue):
+        return False
+    if terms.date_from is not None and keys.start < terms.date_from:
+        return False
+    if terms.date_to is not None and keys.start > terms.date_to:
+        return False
+    return True
+
+
+def event_matches(event: Event, request: SearchRequest) -> bool:
+    """Return True when the event satisfies the request query and every filter.
+
+    Text comparisons are substring matches over accent/case-folded, alias-resolved keys. Hot
+    paths should build ``EventKeys``/``SearchTerms`` once and call ``keys_match`` instead.
+    """
+    return keys_match(EventKeys.from_event(event), SearchTerms.from_request(request))
+
+
+class FuzzyTermResolver:
+    """Corrects misspelled query/team words to the closest names a provider holds.
+
+    Providers consult it only when a search finds nothing, so exact matches never change.
+    Each word of at least ``min_token_length`` characters that is not a known name token is
+    replaced by its nearest trigram neighbour scoring at least ``threshold``. Providers treat a
+    threshold of ``None`` or ``0`` as "no correction" and never build a resolver for it.
+    """
+
+    min_token_length = 4
+
+    def __init__(self, threshold: float = 0.5) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self._teams = TrigramIndex()
+        self._names = TrigramIndex()
+
+    def add(self, team_keys: Iterable[str], other_keys: Iterable[str]) -> None:
+        """Register normalized team keys and league/venue keys (``\\0``-joined values allowed)."""
+        team_tokens = [token for key in team_keys for token in key_tokens(key)]
+        self._teams.add(team_tokens)
+        self._names.add(team_tokens)
+        self._names.add(token for key in other_keys for token in key_tokens(key))
+
+    def resolve(self, terms: SearchTerms) -> Optional[SearchTerms]:
+        """Return terms with corrected query/team words, or ``None`` when nothing changed."""
+        query = self._correct(terms.query, self._names)
+        team = self._correct(terms.team, self._teams)
+        if query == terms.query and team == terms.team:
+            return None
+        return replace(terms, query=query, team=team)
+
+    def _correct(self, term: Optional[str], index: TrigramIndex) -> Optional[str]:
+        if not term:
+            return term
+        words = term.split()
+        for idx, word in enumerate(words):
+            if len(word) >= self.min_token_length and word not in index:
+                words[idx] = index.closest(word, self.threshold) or word
+        return " ".join(words)
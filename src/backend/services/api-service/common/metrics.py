@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_left
+from typing import Callable, List, Optional
+
+
+class LatencyHistogram:
+    """Rolling, fixed-memory latency histogram with log-spaced buckets.
+
+    Samples land in one of ``slices`` time slices covering ``window_seconds``; slices older
+    than the window are reset lazily, so memory stays constant regardless of traffic.
+    Percentiles are reported as the upper edge of the matching bucket (~25% resolution).
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        slices: int = 6,
+        min_ms: float = 1.0,
+        max_ms: float = 60_000.0,
+        buckets_per_decade: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        decades = math.log10(max_ms / min_ms)
+        bucket_count = int(math.ceil(decades * buckets_per_decade)) + 1
+        self._bounds: List[float] = [min_ms * 10 ** (idx / buckets_per_decade) for idx in range(bucket_count)]
+        self._slice_seconds = window_seconds / slices
+        self._clock = clock
+        # One extra bucket per slice catches samples above max_ms.
+        self._counts: List[List[int]] = [[0] * (bucket_count + 1) for _ in range(slices)]
+        self._epochs: List[int] = [-1] * slices
+
+    def record(self, latency_ms: float) -> None:
+        counts = self._current_slice()
+        counts[bisect_left(self._bounds, latency_ms)] += 1
+
+    def count(self) -> int:
+        return sum(sum(counts) for counts in self._live_slices())
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Return the latency (ms) at ``percentile`` (0-100), or ``None`` without samples."""
+        totals = [0] * (len(self._bounds) + 1)
+        for counts in self._live_slices():
+            for idx, value in enumerate(counts):
+                totals[idx] += value
+
+        total = sum(totals)
+        if total == 0:
+            return None
+
+        threshold = max(1, math.ceil(total * percentile / 100.0))
+        cumulative = 0
+        for idx, value in enumerate(totals):
+            cumulative += value
+            if cumulative >= threshold:
+                return self._bounds[min(idx, len(self._bounds) - 1)]
+        return self._bounds[-1]
+
+    def _epoch(self) -> int:
+        return int(self._clock() // self._slice_seconds)
+
+    def _current_slice(self) -> List[int]:
+        epoch = self._epoch()
+        idx = epoch % len(self._counts)
+        if self._epochs[idx] != epoch:
+            self._epochs[idx] = epoch
+            self._counts[idx] = [0] * len(self._counts[idx])
+        return self._counts[idx]
+
+    def _live_slices(self) -> List[List[int]]:
+        epoch = self._epoch()
+        return [
+            counts
+            for counts, slice_epoch in zip(self._counts, self._epochs)
+            if slice_epoch >= 0 and epoch - slice_epoch < len(self._counts)
+        ]
+
+
+class ProviderCallStats:
+    """Latency histogram and outcome counters for calls made to a single provider."""
+
+    def __init__(self, histogram: Optional[LatencyHistogram] = None) -> None:
+        self.latency = histogram or LatencyHistogram()
+        self.success_count = 0
+        self.error_count = 0
+        self.timeout_count = 0
+        self.last_error: Optional[str] = None
+        self.last_call_failed = False
+
+    def record_success(self, latency_ms: float) -> None:
+        self.latency.record(latency_ms)
+        self.success_count += 1
+        self.last_call_failed = False
+
+    def record_error(self, latency_ms: float, message: str) -> None:
+        self.latency.record(latency_ms)
+        self.error_count += 1
+        self.last_error = message
+        self.last_call_failed = True
+
+    def record_timeout(self, latency_ms: float, message: str) -> None:
+        self.latency.record(latency_ms)
+        self.timeout_count += 1
+        self.last_error = message
+        self.last_call_failed = True
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from typing import List
+import heapq
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 from app.schemas import Event
 
 
+def _sort_key(event: Event) -> Tuple[datetime, str]:
+    return event.start_at, event.title
+
+
 def dedupe_events(events: List[Event]) -> List[Event]:
     """Remove duplicate events by event_id, keeping the first occurrence."""
     seen = {}
@@ -16,8 +22,29 @@ def dedupe_events(events: List[Event]) -> List[Event]:
 
 def sort_events(events: List[Event]) -> List[Event]:
     """Sort events by start time then title for deterministic responses."""
-    return sorted(events, key=lambda evt: (evt.start_at, evt.title))
+    return sorted(events, key=_sort_key)
 
 
 def normalize_events(events: List[Event]) -> List[Event]:
     return sort_events(dedupe_events(events))
+
+
+def merge_events(streams: Sequence[Iterable[Event]], limit: Optional[int] = None) -> List[Event]:
+    """K-way merge of streams each sorted by start time then title, deduping by event_id.
+
+    Pops from a heap of the k stream heads, so producing ``limit`` events costs
+    O(limit * log k) rather than sorting everything. On duplicates the first event in merge
+    order wins (ties go to the earlier stream).
+    """
+    merged: List[Event] = []
+    if limit is not None and limit <= 0:
+        return merged
+    seen = set()
+    for event in heapq.merge(*streams, key=_sort_key):
+        if event.event_id in seen:
+            continue
+        seen.add(event.event_id)
+        merged.append(event)
+        if limit is not None and len(merged) >= limit:
+            break
+    return merged
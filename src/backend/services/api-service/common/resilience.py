@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+
+class ProviderError(Exception):
+    """Base class for failures raised by provider connectors."""
+
+
+class CircuitOpenError(ProviderError):
+    """Raised when a provider call is short-circuited by an open breaker."""
+
+
+def backoff_delay(
+    attempt: int,
+    base_seconds: float,
+    max_seconds: float,
+    rand: Callable[[float, float], float] = random.uniform,
+) -> float:
+    """Return a "full jitter" exponential backoff delay for the given retry attempt (0-based)."""
+    ceiling = min(max_seconds, base_seconds * (2**attempt))
+    return rand(0.0, ceiling)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and rejects calls
+    until ``reset_timeout_seconds`` have elapsed; the next call is then let through as a
+    probe whose outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._opened_at is not None:
+            if self._clock() - self._opened_at >= self.reset_timeout_seconds:
+                self._state = CircuitState.HALF_OPEN
+                self._probe_in_flight = False
+        return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        return self._failures
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Free the half-open probe slot without judging the provider (no usable outcome)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+
+class HedgeBudget:
+    """Token budget that caps hedged requests to a fraction of primary traffic.
+
+    Every primary request deposits ``ratio`` tokens (up to ``max_tokens``) and every hedge
+    spends one, so hedging can never add more than ``ratio`` extra load.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = 0.0
+
+    def record_request(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        if self._tokens < 1.0 - 1e-9:  # tolerate float drift from repeated ratio deposits
+            return False
+        self._tokens = max(0.0, self._tokens - 1.0)
+        return True
+
+    def release(self) -> None:
+        """Return a token taken by ``try_acquire`` for a hedge that was not sent."""
+        self._tokens = min(self.max_tokens, self._tokens + 1.0)
+
+
+class RateLimitExceededError(ProviderError):
+    """Raised when a provider's rate limiter cannot admit a request in time."""
+
+
+class TokenBucketRateLimiter:
+    """Async token bucket with a bounded FIFO wait queue.
+
+    Tokens refill at ``rate_per_second`` up to ``burst``. A caller that cannot take a token
+    immediately reserves the next one and sleeps until it is due; callers are rejected with
+    ``RateLimitExceededError`` when ``max_queue`` callers are already waiting or the wait would
+    exceed ``max_wait_seconds``.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int = 10,
+        max_queue: int = 50,
+        max_wait_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._waiting = 0
+        self._rejected = 0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @property
+    def rejected(self) -> int:
+        return self._rejected
+
+    @property
+    def tokens_available(self) -> float:
+        self._refill()
+        return max(0.0, self._tokens)
+
+    @property
+    def saturated(self) -> bool:
+        return self._waiting >= self.max_queue
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now and nobody is queued."""
+        self._refill()
+        if self._waiting or self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    async def acquire(self) -> None:
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return
+
+        wait_seconds = (1.0 - self._tokens) / self.rate_per_second
+        if self._waiting >= self.max_queue or wait_seconds > self.max_wait_seconds:
+            self._rejected += 1
+            raise RateLimitExceededError(
+                f"Rate limit exceeded ({self._waiting} waiting, next slot in {wait_seconds:.3f}s)"
+            )
+
+        # Reserve the next token now so later callers queue behind this one.
+        self._tokens -= 1.0
+        self._waiting += 1
+        try:
+            await asyncio.sleep(wait_seconds)
+        except asyncio.CancelledError:
+            self._tokens += 1.0
+            raise
+        finally:
+            self._waiting -= 1
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate_per_second)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+class SubstringIndex:
+    """Inverted index from tokens to document ids with substring lookups.
+
+    Posting sets are keyed by exact token. A fragment occurs in a token exactly when it starts
+    one of the token's suffixes, so a sorted list of every suffix of every distinct token lets a
+    fragment resolve by bisection to the tokens containing it; the extra memory scales with the
+    vocabulary, not with the number of documents.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[int]] = {}
+        self._suffixes: List[Tuple[str, str]] = []
+        # New suffixes are appended unsorted and sorted in one pass before the next lookup.
+        self._suffixes_sorted = True
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def add(self, doc_id: int, tokens: Iterable[str]) -> None:
+        for token in set(tokens):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._suffixes.extend((token[idx:], token) for idx in range(len(token)))
+                self._suffixes_sorted = False
+            postings.add(doc_id)
+
+    def remove(self, doc_id: int, tokens: Iterable[str]) -> None:
+        for token in set(tokens):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                suffixes = self._sorted_suffixes()
+                for idx in range(len(token)):
+                    del suffixes[bisect_left(suffixes, (token[idx:], token))]
+
+    def lookup(self, fragment: str) -> Set[int]:
+        """Return ids of documents holding a token that contains ``fragment`` (do not mutate)."""
+        suffixes = self._sorted_suffixes()
+        idx = bisect_left(suffixes, (fragment, ""))
+        tokens: Set[str] = set()
+        while idx < len(suffixes) and suffixes[idx][0].startswith(fragment):
+            tokens.add(suffixes[idx][1])
+            idx += 1
+        matched = [self._postings[token] for token in tokens]
+        if not matched:
+            return set()
+        if len(matched) == 1:
+            return matched[0]
+        return set().union(*matched)
+
+    def match_all(self, fragments: Sequence[str]) -> Set[int]:
+        """Return ids of documents containing every fragment (AND semantics)."""
+        postings = sorted((self.lookup(fragment) for fragment in fragments), key=len)
+        if not postings:
+            return set()
+        result = set(postings[0])
+        for other in postings[1:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+    def _sorted_suffixes(self) -> List[Tuple[str, str]]:
+        if not self._suffixes_sorted:
+            self._suffixes.sort()
+            self._suffixes_sorted = True
+        return self._suffixes
+
+
+def utc_timestamp(value: datetime) -> float:
+    """POSIX timestamp of ``value``, treating naive datetimes as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class StartTimeIndex:
+    """Document ids kept ordered by start time so date windows resolve by bisection."""
+
+    def __init__(self) -> None:
+        self._keys: List[Tuple[float, int]] = []
+        self._timestamps: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add_many(self, entries: Iterable[Tuple[int, datetime]]) -> None:
+        new_keys = [(utc_timestamp(start_at), doc_id) for doc_id, start_at in entries]
+        if not new_keys:
+            return
+        self._timestamps.update((doc_id, timestamp) for timestamp, doc_id in new_keys)
+        # Timsort merges the appended run with the already-sorted keys in near-linear time.
+        self._keys.extend(new_keys)
+        self._keys.sort()
+
+    def remove(self, doc_id: int) -> None:
+        timestamp = self._timestamps.pop(doc_id, None)
+        if timestamp is None:
+            return
+        key = (timestamp, doc_id)
+        idx = bisect_left(self._keys, key)
+        if idx < len(self._keys) and self._keys[idx] == key:
+            del self._keys[idx]
+
+    def sort_key(self, doc_id: int) -> Tuple[float, int]:
+        return self._timestamps[doc_id], doc_id
+
+    def window(self, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None) -> Tuple[int, int]:
+        """Return the ``[lo, hi)`` positions of documents starting within the inclusive window."""
+        lo = bisect_left(self._keys, (utc_timestamp(date_from), -1)) if date_from else 0
+        hi = bisect_right(self._keys, (utc_timestamp(date_to), math.inf)) if date_to else len(self._keys)
+        return lo, max(lo, hi)
+
+    def ids(self, lo: int, hi: int) -> Iterator[int]:
+        keys = self._keys
+        for idx in range(lo, hi):
+            yield keys[idx][1]
+
+
+def trigrams(token: str) -> Set[str]:
+    """Padded character trigrams of a single word (``"abc"`` -> ``"  a", " ab", "abc", "bc "``)."""
+    padded = f"  {token} "
+    return {padded[idx : idx + 3] for idx in range(len(padded) - 2)}
+
+
+def _deletions(token: str) -> Set[str]:
+    return {token[:idx] + token[idx + 1 :] for idx in range(len(token))}
+
+
+class TrigramIndex:
+    """Fuzzy (misspelling-tolerant) lookups over distinct word tokens.
+
+    Similarity is the Jaccard overlap of padded trigram sets, as in PostgreSQL's pg_trgm.
+    Common slips (one inserted, dropped or replaced character) are found through a
+    single-deletion dictionary in a handful of hash lookups; only words of at least
+    ``scan_min_length`` characters fall back to counting shared trigrams across the
+    posting lists. Tokens are only ever added;
+    a stale token can at worst suggest a correction that then matches nothing.
+    """
+
+    scan_min_length = 8
+
+    def __init__(self) -> None:
+        self._tokens: List[str] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._deletes: Dict[str, List[int]] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._ids
+
+    def add(self, tokens: Iterable[str]) -> None:
+        for token in tokens:
+            if token in self._ids:
+                continue
+            token_id = self._ids[token] = len(self._tokens)
+            self._tokens.append(token)
+            grams = frozenset(trigrams(token))
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(token_id)
+            for variant in _deletions(token):
+                self._deletes.setdefault(variant, []).append(token_id)
+
+    def closest(self, token: str, threshold: float) -> Optional[str]:
+        """Return the most similar known token scoring at least ``threshold``, if any."""
+        if token in self._ids:
+            return token
+        grams = trigrams(token)
+        # Within one edit: ``token`` minus a character is known, ``token`` is a known token minus
+        # a character, or both lose the same position (substitution).
+        near: Set[int] = set()
+        for variant in _deletions(token):
+            if variant in self._ids:
+                near.add(self._ids[variant])
+            near.update(self._deletes.get(variant, ()))
+        near.update(self._deletes.get(token, ()))
+        best = self._best(grams, near, threshold)
+        if best is not None or len(token) < self.scan_min_length:
+            return best
+
+        # Longer words can carry several slips and still clear the threshold: count shared
+        # trigrams across the posting lists (milliseconds on large vocabularies).
+        counts: Counter[int] = Counter()
+        for gram in grams:
+            counts.update(self._postings.get(gram, ()))
+        return self._best(grams, counts, threshold)
+
+    def _best(self, grams: Set[str], token_ids: Iterable[int], threshold: float) -> Optional[str]:
+        best: Optional[str] = None
+        best_score = threshold
+        for token_id in token_ids:
+            candidate = self._tokens[token_id]
+            shared = len(grams & self._grams[token_id])
+            score = shared / (len(grams) + len(self._grams[token_id]) - shared)
+            if score > best_score or (score == best_score and (best is None or len(candidate) < len(best))):
+                best, best_score = candidate, score
+        return best
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import gc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence
+
+from pydantic import TypeAdapter
+
+from app.schemas import Event, SearchResponse
+
+EVENT_LIST_ADAPTER: TypeAdapter[List[Event]] = TypeAdapter(List[Event])
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Suspend the cyclic garbage collector around a burst of allocations.
+
+    Building thousands of nested models triggers repeated generation-0/1 collections that
+    scan every freshly allocated object; pausing collection for the (synchronous) batch
+    cuts conversion time by more than half. Never hold this across an ``await``.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def validate_events(payloads: Sequence[Dict[str, Any]]) -> List[Event]:
+    """Validate a batch of event dicts in one pydantic-core call."""
+    if not payloads:
+        return []
+    with gc_paused():
+        return EVENT_LIST_ADAPTER.validate_python(payloads)
+
+
+def events_to_documents(events: Sequence[Event]) -> List[Dict[str, Any]]:
+    """Dump events to JSON-compatible dicts suitable for storage (e.g. BSON)."""
+    with gc_paused():
+        return EVENT_LIST_ADAPTER.dump_python(list(events), mode="json")
+
+
+def encode_search_response(events: Sequence[Event]) -> bytes:
+    """Encode events as the JSON body of a ``SearchResponse`` in one pydantic-core call.
+
+    The bytes match what FastAPI would emit for ``SearchResponse.from_events(events)``, so
+    cached bodies can be sent as-is without rebuilding or re-validating the response model.
+    """
+    results = EVENT_LIST_ADAPTER.dump_json(list(events))
+    return b'{"results":' + results + b',"total":' + str(len(events)).encode() + b"}"
+
+
+def decode_search_response(body: bytes) -> List[Event]:
+    """Parse a ``SearchResponse`` JSON body back into events in one pydantic-core call."""
+    with gc_paused():
+        return SearchResponse.model_validate_json(body).results
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+# Common short names for teams/leagues, keyed and valued by their normalized form.
+ALIASES: Dict[str, str] = {
+    "barca": "barcelona",
+    "atleti": "atletico madrid",
+    "man utd": "manchester united",
+    "man united": "manchester united",
+    "man city": "manchester city",
+    "psg": "paris saint germain",
+    "juve": "juventus",
+    "epl": "premier league",
+    "nyy": "new york yankees",
+}
+_MAX_ALIAS_TOKENS = max(len(alias.split()) for alias in ALIASES)
+_ALIAS_FIRST_TOKENS = frozenset(alias.split()[0] for alias in ALIASES)
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Casefold, strip accents and collapse punctuation/whitespace into single spaces."""
+    if not value:
+        return ""
+    folded = value.casefold()
+    if not folded.isascii():
+        decomposed = unicodedata.normalize("NFKD", folded)
+        folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", folded).strip()
+
+
+def _apply_aliases(tokens: List[str]) -> List[str]:
+    result: List[str] = []
+    idx = 0
+    while idx < len(tokens):
+        if tokens[idx] not in _ALIAS_FIRST_TOKENS:
+            result.append(tokens[idx])
+            idx += 1
+            continue
+        for width in range(min(_MAX_ALIAS_TOKENS, len(tokens) - idx), 0, -1):
+            canonical = ALIASES.get(" ".join(tokens[idx : idx + width]))
+            if canonical is not None:
+                result.append(canonical)
+                idx += width
+                break
+        else:
+            result.append(tokens[idx])
+            idx += 1
+    return result
+
+
+@lru_cache(maxsize=65_536)
+def search_key(value: Optional[str]) -> str:
+    """Normalized text with whole-word aliases replaced by their canonical names.
+
+    Events and queries both go through this, so "Atlético", "atletico" and "Atleti" compare equal.
+    Cached because team, league and venue names repeat heavily across a catalog.
+    """
+    return " ".join(_apply_aliases(normalize_text(value).split()))
+
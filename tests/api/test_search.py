@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+import time
 from pathlib import Path
 
 from fastapi.testclient import TestClient
@@ -12,6 +13,7 @@ if str(SERVICE_ROOT) not in sys.path:
     sys.path.append(str(SERVICE_ROOT))
 
 from app.main import app  # noqa: E402
+from app.schemas import SearchResponse  # noqa: E402
 
 client = TestClient(app)
 
@@ -46,3 +48,24 @@ def test_search_filters_by_league():
     payload = response.json()
     assert payload["total"] == 1
     assert payload["results"][0]["league"] == "NBA"
+
+
+def test_search_cached_body_matches_model_serialization():
+    first = client.post("/v1/search", json={"query": "Lakers"})
+    second = client.post("/v1/search", json={"query": "Lakers"})
+
+    assert first.headers["content-type"] == "application/json"
+    assert second.content == first.content
+    assert SearchResponse.model_validate_json(second.content).model_dump(mode="json") == second.json()
+
+
+def test_ready_reports_warm_up_completion():
+    with TestClient(app) as lifespan_client:
+        for _ in range(50):
+            response = lifespan_client.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.02)
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.append(str(SERVICE_ROOT))
+
+from app.schemas import Event  # noqa: E402
+
+CATALOG_TEAMS = [
+    "Real Madrid",
+    "Atlético Madrid",
+    "Sevilla",
+    "London City",
+    "Boston Celtics",
+    "New York Knicks",
+    "FC Barcelona",
+]
+CATALOG_LEAGUES = ["La Liga", "Premier League", "NBA"]
+CATALOG_CITIES = ["Madrid", "London", "Boston"]
+
+
+def build_catalog(count: int, start: datetime) -> List[Event]:
+    """Small synthetic catalog with overlapping teams, optional leagues and spread-out start times."""
+    teams = CATALOG_TEAMS
+    return [
+        Event(
+            event_id=f"evt-{idx}",
+            title=f"{teams[idx % len(teams)]} vs {teams[(idx + 1) % len(teams)]}",
+            league=CATALOG_LEAGUES[idx % 3] if idx % 5 else None,
+            venue=f"Stadium {idx % 5}, {CATALOG_CITIES[(idx // 2) % 3]}",
+            start_at=start + timedelta(hours=(idx * 37) % 500),
+            teams=[teams[idx % len(teams)], teams[(idx + 1) % len(teams)]],
+        )
+        for idx in range(count)
+    ]
+
+
+@pytest.fixture
+def make_catalog() -> Callable[[int, datetime], List[Event]]:
+    """Factory for the synthetic catalog the provider parity tests compare backends on."""
+    return build_catalog
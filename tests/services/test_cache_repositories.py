@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import bson
+from pymongo.errors import OperationFailure
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.append(str(SERVICE_ROOT))
+
+from app.repositories import CacheFreshness, InMemorySearchCache, LayeredSearchCache  # noqa: E402
+from app.repositories_mongo import MongoSearchCacheRepository  # noqa: E402
+from app.schemas import Currency, Event, Price, SearchRequest, SeatDetails, TicketListing  # noqa: E402
+from common.serialization import encode_search_response  # noqa: E402
+
+
+class FakeAsyncDatabase:
+    def __init__(self) -> None:
+        self.commands = []
+
+    async def command(self, name, value, **kwargs):
+        self.commands.append((name, value, kwargs))
+
+
+class FakeAsyncCursor:
+    def __init__(self, documents: List[dict]) -> None:
+        self.documents = documents
+
+    def sort(self, field, direction):
+        self.documents.sort(key=lambda doc: doc.get(field, 0), reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.documents[:length]
+
+
+class FakeAsyncCollection:
+    """Minimal async stand-in for a Motor collection that round-trips documents through BSON."""
+
+    def __init__(self, name: str = "search_cache") -> None:
+        self.name = name
+        self.database = FakeAsyncDatabase()
+        self.documents: Dict[str, bytes] = {}
+        self.indexes = []
+
+    async def find_one(self, query, projection=None):
+        raw = self.documents.get(query["_id"])
+        return bson.decode(raw) if raw is not None else None
+
+    def find(self, query, projection=None):
+        docs = [bson.decode(raw) for raw in self.documents.values()]
+        if "_id" in query:
+            docs = [doc for doc in docs if doc["_id"] in query["_id"]["$in"]]
+        docs = [doc for doc in docs if all(field in doc for field in query if field != "_id")]
+        return FakeAsyncCursor(docs)
+
+    async def replace_one(self, query, document, upsert=False):
+        self.documents[query["_id"]] = bson.encode(document)
+
+    async def update_one(self, query, update, upsert=False):
+        raw = self.documents.get(query["_id"])
+        if raw is None and not upsert:
+            return
+        doc = bson.decode(raw) if raw is not None else {"_id": query["_id"]}
+        for field, amount in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + amount
+        doc.update(update.get("$set", {}))
+        self.documents[query["_id"]] = bson.encode(doc)
+
+    async def create_index(self, key, **kwargs):
+        self.indexes.append((key, kwargs))
+
+
+def make_event(event_id: str = "evt-1") -> Event:
+    return Event(
+        event_id=event_id,
+        title="Cached Event",
+        league="League",
+        venue="Venue",
+        start_at=datetime(2024, 5, 1, 18, tzinfo=timezone.utc),
+        teams=["A", "B"],
+        listings=[
+            TicketListing(
+                listing_id="list-1",
+                provider="cache",
+                url="https://tickets.example.com/1",
+                price=Price(amount=55, currency=Currency.EUR),
+                seat=SeatDetails(section="A"),
+                fetched_at=datetime(2024, 4, 1, tzinfo=timezone.utc),
+            )
+        ],
+    )
+
+
+def test_mongo_cache_round_trips_events_through_bson():
+    collection = FakeAsyncCollection()
+    repo = MongoSearchCacheRepository(collection=collection, ttl_seconds=60)
+    event = make_event()
+
+    async def scenario():
+        await repo.set("search:key", [event])
+        return await repo.get("search:key")
+
+    cached = asyncio.run(scenario())
+
+    assert cached == [event]
+
+
+def test_inmemory_cache_evicts_least_recently_used_entries():
+    cache = InMemorySearchCache(ttl_seconds=60, max_entries=2)
+
+    async def scenario():
+        await cache.set("a", [make_event("evt-a")])
+        await cache.set("b", [make_event("evt-b")])
+        await cache.get("a")
+        await cache.set("c", [make_event("evt-c")])
+        found = [await cache.get(key) is not None for key in ("a", "b", "c")]
+        await cache.aclose()
+        return found
+
+    assert asyncio.run(scenario()) == [True, False, True]
+    assert cache.evictions == 1
+
+
+def test_inmemory_cache_respects_byte_budget_and_sweeps_expired_entries():
+    event_bytes = len(encode_search_response([make_event()]))
+    cache = InMemorySearchCache(ttl_seconds=0, max_bytes=event_bytes * 2, sweep_interval_seconds=0.01)
+
+    async def scenario():
+        for key in ("a", "b", "c"):
+            await cache.set(key, [make_event()])
+        sizes = (len(cache), cache.size_bytes)
+        await asyncio.sleep(0.05)
+        await cache.aclose()
+        return sizes
+
+    assert asyncio.run(scenario()) == (2, event_bytes * 2)
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+def test_inmemory_cache_drops_previous_entry_when_replacement_exceeds_byte_budget():
+    event_bytes = len(encode_search_response([make_event()]))
+    cache = InMemorySearchCache(ttl_seconds=60, max_bytes=event_bytes * 2)
+
+    async def scenario():
+        await cache.set("a", [make_event("evt-old")])
+        await cache.set("a", [make_event(f"evt-{idx}") for idx in range(3)])
+        found = await cache.lookup("a")
+        await cache.aclose()
+        return found
+
+    assert asyncio.run(scenario()) is None
+    assert cache.size_bytes == 0
+
+
+def test_inmemory_cache_reports_stale_entries_within_configured_windows():
+    now = [1000.0]
+    cache = InMemorySearchCache(
+        ttl_seconds=10, stale_while_revalidate_seconds=5, stale_if_error_seconds=60, clock=lambda: now[0]
+    )
+
+    async def scenario():
+        await cache.set("key", [make_event()])
+        states = []
+        for age in (10, 15, 70, 71):
+            now[0] = 1000.0 + age
+            cached = await cache.lookup("key")
+            states.append(cached.freshness if cached else None)
+        await cache.aclose()
+        return states
+
+    assert asyncio.run(scenario()) == [
+        CacheFreshness.FRESH,
+        CacheFreshness.STALE,
+        CacheFreshness.STALE_IF_ERROR,
+        None,
+    ]
+    assert len(cache) == 0
+
+
+def test_mongo_cache_serves_stale_documents_and_extends_ttl_index():
+    collection = FakeAsyncCollection()
+    repo = MongoSearchCacheRepository(collection=collection, ttl_seconds=60, stale_while_revalidate_seconds=30)
+
+    async def scenario():
+        await repo.set("search:key", [make_event()])
+        stored = bson.decode(collection.documents["search:key"])
+        stored["created_at"] = stored["created_at"] - timedelta(seconds=75)
+        collection.documents["search:key"] = bson.encode(stored)
+        await repo.ensure_indexes()
+        return await repo.get("search:key"), await repo.lookup("search:key")
+
+    fresh, cached = asyncio.run(scenario())
+
+    assert fresh is None
+    assert cached.freshness is CacheFreshness.STALE
+    assert collection.indexes == [("created_at", {"expireAfterSeconds": 90})]
+
+
+def test_layered_cache_promotes_l2_hits_within_l2_expiry():
+    collection = FakeAsyncCollection()
+    l2 = MongoSearchCacheRepository(collection=collection, ttl_seconds=60)
+    now = [1000.0]
+    l1 = InMemorySearchCache(ttl_seconds=30, clock=lambda: now[0])
+    cache = LayeredSearchCache(l1=l1, l2=l2)
+    other_worker = LayeredSearchCache(l1=InMemorySearchCache(ttl_seconds=30), l2=l2)
+
+    async def scenario():
+        await other_worker.set("search:key", [make_event()])
+        stored = bson.decode(collection.documents["search:key"])
+        stored["created_at"] = stored["created_at"] - timedelta(seconds=50)
+        collection.documents["search:key"] = bson.encode(stored)
+
+        promoted = await cache.get("search:key")
+        collection.documents.clear()
+        from_l1 = await cache.get("search:key")
+        now[0] += 15
+        after_l2_expiry = await cache.get("search:key")
+        await cache.aclose()
+        await other_worker.aclose()
+        return promoted, from_l1, after_l2_expiry
+
+    promoted, from_l1, after_l2_expiry = asyncio.run(scenario())
+
+    assert promoted == [make_event()]
+    assert from_l1 == [make_event()]
+    # L2 had ~10s of freshness left, so the L1 copy must not outlive it despite its 30s TTL.
+    assert after_l2_expiry is None
+
+
+def test_mongo_cache_compressed_blobs_round_trip_and_read_legacy_documents():
+    collection = FakeAsyncCollection()
+    legacy = MongoSearchCacheRepository(collection=collection, ttl_seconds=60)
+    compact = MongoSearchCacheRepository(collection=collection, ttl_seconds=60, compressed=True)
+    events = [make_event("evt-a"), make_event("evt-b")]
+
+    async def scenario():
+        await legacy.set("search:old", events, limit=25)
+        await compact.set("search:new", events, limit=25)
+        return await compact.lookup("search:old"), await compact.lookup("search:new")
+
+    old, new = asyncio.run(scenario())
+
+    assert old.events == new.events == events
+    assert new.body == encode_search_response(events)
+    assert new.limit == 25
+    assert set(bson.decode(collection.documents["search:new"])) == {"_id", "limit", "created_at", "v", "blob"}
+    assert len(collection.documents["search:new"]) < len(collection.documents["search:old"])
+    # Writes no longer pay for index management.
+    assert collection.indexes == []
+
+
+def test_mongo_cache_treats_unknown_blob_versions_as_misses():
+    collection = FakeAsyncCollection()
+    repo = MongoSearchCacheRepository(collection=collection, ttl_seconds=60, compressed=True)
+
+    async def scenario():
+        await repo.set("search:key", [make_event()])
+        stored = bson.decode(collection.documents["search:key"])
+        stored["v"] = MongoSearchCacheRepository.COMPRESSED_SCHEMA_VERSION + 1
+        collection.documents["search:key"] = bson.encode(stored)
+        return await repo.lookup("search:key")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_mongo_cache_updates_ttl_of_existing_index():
+    collection = FakeAsyncCollection()
+    repo = MongoSearchCacheRepository(collection=collection, ttl_seconds=60)
+
+    async def conflicting_index(key, **kwargs):
+        raise OperationFailure("Index with name: created_at_1 already exists with different options", code=85)
+
+    collection.create_index = conflicting_index
+    asyncio.run(repo.ensure_indexes())
+
+    assert collection.database.commands == [
+        ("collMod", "search_cache", {"index": {"keyPattern": {"created_at": 1}, "expireAfterSeconds": 60}})
+    ]
+
+
+def test_mongo_cache_ranks_requests_by_popularity_and_reports_expiring_keys():
+    collection = FakeAsyncCollection()
+    popularity = FakeAsyncCollection("search_popularity")
+    repo = MongoSearchCacheRepository(collection=collection, ttl_seconds=60, popularity_collection=popularity)
+
+    async def scenario():
+        await repo.set("search:rare", [make_event()], request=SearchRequest(query="rare"))
+        await repo.set("search:hot", [make_event()], request=SearchRequest(query="hot"))
+        for _ in range(3):
+            await repo.lookup("search:hot")
+        await repo.lookup("search:unknown")
+        stored = bson.decode(collection.documents["search:rare"])
+        stored["created_at"] = stored["created_at"] - timedelta(seconds=45)
+        collection.documents["search:rare"] = bson.encode(stored)
+        await repo.ensure_indexes()
+        popular = await repo.popular_requests(5)
+        expiring = await repo.expiring_keys(["search:hot", "search:rare", "search:gone"], within_seconds=30)
+        return popular, expiring
+
+    popular, expiring = asyncio.run(scenario())
+
+    assert [request.query for request in popular] == ["hot", "rare"]
+    # Lookups never create counters on their own: only writes know the request.
+    assert set(popularity.documents) == {"search:hot", "search:rare"}
+    assert expiring == {"search:rare", "search:gone"}
+    assert ("last_seen_at", {"expireAfterSeconds": 7 * 24 * 3600}) in popularity.indexes
+
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.append(str(SERVICE_ROOT))
+
+from app.repositories import sample_events  # noqa: E402
+from app.repositories_columnar import ColumnarProviderRepository  # noqa: E402
+from app.schemas import Event, SearchFilters, SearchRequest  # noqa: E402
+from common.matching import event_matches  # noqa: E402
+
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def expected_ids(events: list[Event], request: SearchRequest) -> list[str]:
+    ordered = sorted(events, key=lambda event: event.start_at)
+    return [event.event_id for event in ordered if event_matches(event, request)][: request.limit]
+
+
+def search_ids(repo: ColumnarProviderRepository, request: SearchRequest) -> list[str]:
+    return [event.event_id for event in asyncio.run(repo.search(request))]
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        SearchRequest(query="madrid"),
+        SearchRequest(query="Atleti", filters=SearchFilters(team="atletico")),
+        SearchRequest(query="drid vs sev", limit=5),
+        SearchRequest(query="liga", filters=SearchFilters(location="london")),
+        SearchRequest(filters=SearchFilters(team="celtics", league="nba")),
+        SearchRequest(filters=SearchFilters(date_from=START + timedelta(hours=100), date_to=START + timedelta(hours=150))),
+        SearchRequest(query="knicks", filters=SearchFilters(date_from=START + timedelta(hours=400), league="premier")),
+        SearchRequest(query="valhalla"),
+    ],
+)
+def test_columnar_provider_matches_event_matches_semantics(make_catalog, request_):
+    events = make_catalog(300, START)
+    repo = ColumnarProviderRepository(events)
+    repo.block_size = 64
+
+    assert search_ids(repo, request_) == expected_ids(events, request_)
+
+
+def test_columnar_provider_rebuilds_full_events():
+    events = sample_events("sample-tickets")
+    repo = ColumnarProviderRepository(events)
+
+    found = asyncio.run(repo.search(SearchRequest(query="real madrid")))
+
+    assert found == [events[0]]
+
+
+def test_columnar_provider_corrects_misspelled_team_on_a_miss():
+    repo = ColumnarProviderRepository(sample_events("sample-tickets"))
+
+    assert [event.event_id for event in asyncio.run(repo.search(SearchRequest(query="Barcelonna")))] == ["evt-001"]
+    assert search_ids(repo, SearchRequest(filters=SearchFilters(team="Yankes"))) == ["evt-002"]
@@ -13,9 +13,12 @@ if str(SERVICE_ROOT) not in sys.path:
 from app.dependencies import (  # noqa: E402
     get_app_settings,
     get_cache_repository,
+    get_provider_repository,
     get_user_profile_repository,
 )
+from app.repositories import InMemorySearchCache, LayeredSearchCache  # noqa: E402
 from app.repositories_mongo import MongoSearchCacheRepository, MongoUserProfileRepository  # noqa: E402
+from common.config import reset_settings_cache  # noqa: E402
 
 
 class FakeCollection:
@@ -31,12 +34,16 @@ class FakeDatabase(dict):
 
 @pytest.fixture(autouse=True)
 def reset_caches():
+    reset_settings_cache()
     get_app_settings.cache_clear()
     get_cache_repository.cache_clear()
+    get_provider_repository.cache_clear()
     get_user_profile_repository.cache_clear()
     yield
+    reset_settings_cache()
     get_app_settings.cache_clear()
     get_cache_repository.cache_clear()
+    get_provider_repository.cache_clear()
     get_user_profile_repository.cache_clear()
 
 
@@ -51,7 +58,37 @@ def test_cache_repository_uses_mongo_when_enabled(monkeypatch):
     monkeypatch.setattr(deps, "get_database", lambda settings: fake_db)
 
     repo = get_cache_repository()
-    assert isinstance(repo, MongoSearchCacheRepository)
+    assert isinstance(repo, LayeredSearchCache)
+    assert isinstance(repo.l2, MongoSearchCacheRepository)
+    assert repo.l1.ttl_seconds == 10
+
+
+def test_cache_repository_skips_l1_when_disabled(monkeypatch):
+    fake_db = FakeDatabase()
+
+    monkeypatch.setenv("TW_MONGODB_URI", "mongodb://fake-uri")
+    monkeypatch.setenv("TW_USE_MONGO_CACHE", "true")
+    monkeypatch.setenv("TW_SEARCH_CACHE_L1_TTL_SECONDS", "0")
+
+    import app.dependencies as deps  # noqa: E402
+    monkeypatch.setattr(deps, "get_database", lambda settings: fake_db)
+
+    assert isinstance(get_cache_repository(), MongoSearchCacheRepository)
+
+
+def test_cache_repository_byte_budget_can_be_switched_off(monkeypatch):
+    monkeypatch.setenv("TW_SEARCH_CACHE_MAX_BYTES", "0")
+
+    repo = get_cache_repository()
+    assert isinstance(repo, InMemorySearchCache)
+    assert repo.max_bytes is None
+
+
+def test_stub_catalog_spelling_correction_can_be_switched_off(monkeypatch):
+    monkeypatch.setenv("TW_STUB_CATALOG_FUZZY_THRESHOLD", "0")
+
+    [catalog] = get_provider_repository().providers
+    assert catalog._fuzzy is None
 
 
 def test_profile_repository_uses_mongo_when_enabled(monkeypatch):
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.append(str(SERVICE_ROOT))
+
+from app.repositories import InMemoryProviderRepository  # noqa: E402
+from app.schemas import Event, SearchFilters, SearchRequest  # noqa: E402
+from common.matching import FuzzyTermResolver, event_matches  # noqa: E402
+from common.search_index import SubstringIndex, TrigramIndex  # noqa: E402
+from common.text import search_key  # noqa: E402
+
+
+def make_event(event_id: str, title: str, league: str, venue: str, teams: list[str], day: int = 1) -> Event:
+    return Event(
+        event_id=event_id,
+        title=title,
+        league=league,
+        venue=venue,
+        start_at=datetime(2025, 3, day, 20, tzinfo=timezone.utc),
+        teams=teams,
+    )
+
+
+def search_ids(repo: InMemoryProviderRepository, **kwargs) -> list[str]:
+    return [event.event_id for event in asyncio.run(repo.search(SearchRequest(**kwargs)))]
+
+
+def test_substring_index_matches_token_fragments_and_forgets_removed_docs():
+    index = SubstringIndex()
+    index.add(1, ["real", "madrid"])
+    index.add(2, ["real", "betis"])
+
+    assert index.lookup("rea") == {1, 2}
+    assert index.lookup("eal") == {1, 2}
+    assert index.match_all(["al", "dri"]) == {1}
+
+    index.remove(1, ["real", "madrid"])
+    assert index.match_all(["real", "mad"]) == set()
+    assert index.lookup("drid") == set()
+    assert len(index) == 2
+
+
+def test_inmemory_provider_intersects_query_and_filters():
+    repo = InMemoryProviderRepository(
+        events=[
+            make_event("evt-1", "Real Madrid vs Sevilla", "La Liga", "Bernabeu, Madrid", ["Real Madrid", "Sevilla"]),
+            make_event("evt-2", "Real Betis vs Valencia", "La Liga", "Benito Villamarin, Sevilla", ["Real Betis", "Valencia"]),
+            make_event("evt-3", "Madrid Derby", "Copa", "Metropolitano, Madrid", ["Atletico Madrid", "Real Madrid"]),
+        ]
+    )
+
+    assert search_ids(repo, query="Real") == ["evt-1", "evt-2", "evt-3"]
+    assert search_ids(repo, query="madrid", filters=SearchFilters(league="liga")) == ["evt-1"]
+    assert search_ids(repo, filters=SearchFilters(team="Sevilla", location="Madrid")) == ["evt-1"]
+    assert search_ids(repo, query="Real", limit=2) == ["evt-1", "evt-2"]
+
+
+CATALOG_START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        SearchRequest(query="madrid"),
+        SearchRequest(query="drid"),
+        SearchRequest(query="celona"),
+        SearchRequest(query="Atleti", filters=SearchFilters(team="atletico")),
+        SearchRequest(query="drid vs sev", limit=5),
+        SearchRequest(query="al mad", filters=SearchFilters(team="arcelo")),
+        SearchRequest(query="liga", filters=SearchFilters(location="ondon")),
+        SearchRequest(filters=SearchFilters(team="celtics", league="ba")),
+        SearchRequest(query="knicks", filters=SearchFilters(date_from=CATALOG_START + timedelta(hours=400), league="mier")),
+        SearchRequest(query="valhalla"),
+    ],
+)
+def test_inmemory_provider_matches_event_matches_semantics(make_catalog, request_):
+    events = make_catalog(300, CATALOG_START)
+    repo = InMemoryProviderRepository(events=events)
+
+    ordered = sorted(events, key=lambda event: event.start_at)
+    expected = [event.event_id for event in ordered if event_matches(event, request_)][: request_.limit]
+    assert [event.event_id for event in repo.find(request_, correct_spelling=False)] == expected
+
+
+def test_inmemory_provider_updates_index_on_add_and_remove():
+    repo = InMemoryProviderRepository(events=[])
+    repo.add_events([make_event("evt-1", "Lakers vs Celtics", "NBA", "Arena", ["Lakers", "Celtics"])])
+    assert search_ids(repo, query="celtics") == ["evt-1"]
+
+    repo.add_events([make_event("evt-1", "Lakers vs Knicks", "NBA", "Arena", ["Lakers", "Knicks"])])
+    assert search_ids(repo, query="celtics") == []
+    assert search_ids(repo, query="knicks") == ["evt-1"]
+
+    assert repo.remove_event("evt-1")
+    assert search_ids(repo, query="lakers") == []
+    assert len(repo) == 0
+
+
+def test_inmemory_provider_keeps_last_copy_of_duplicate_event_in_one_batch():
+    first = make_event("evt-1", "Lakers vs Celtics", "NBA", "Arena", ["Lakers", "Celtics"], day=2)
+    repo = InMemoryProviderRepository(events=[first, first.model_copy(update={"title": "Lakers vs Knicks"})])
+
+    assert len(repo) == 1
+    assert len(repo._start_index) == 1
+    found = repo.find(SearchRequest(filters=SearchFilters(date_from=datetime(2025, 3, 1, tzinfo=timezone.utc))))
+    assert [event.title for event in found] == ["Lakers vs Knicks"]
+
+
+def test_inmemory_provider_resolves_date_windows_in_start_order():
+    repo = InMemoryProviderRepository(
+        events=[
+            make_event("evt-late", "Lakers vs Knicks", "NBA", "Arena", ["Lakers", "Knicks"], day=20),
+            make_event("evt-early", "Lakers vs Celtics", "NBA", "Arena", ["Lakers", "Celtics"], day=2),
+            make_event("evt-mid", "Bulls vs Heat", "NBA", "Center", ["Bulls", "Heat"], day=10),
+        ]
+    )
+    window = SearchFilters(
+        date_from=datetime(2025, 3, 2, tzinfo=timezone.utc),
+        date_to=datetime(2025, 3, 10, 20, tzinfo=timezone.utc),
+    )
+
+    assert search_ids(repo, filters=window) == ["evt-early", "evt-mid"]
+    assert search_ids(repo, query="lakers", filters=SearchFilters(date_from=datetime(2025, 3, 5))) == ["evt-late"]
+
+    assert repo.remove_event("evt-early")
+    assert search_ids(repo, filters=window) == ["evt-mid"]
+
+
+def test_search_key_folds_case_accents_punctuation_and_aliases():
+    assert search_key("  Atlético-MADRID ") == "atletico madrid"
+    assert search_key("Barça") == "barcelona"
+    assert search_key("Man Utd vs Man City") == "manchester united vs manchester city"
+
+
+def test_inmemory_provider_matches_normalized_text():
+    repo = InMemoryProviderRepository(
+        events=[
+            make_event("evt-1", "Atlético Madrid vs FC Barcelona", "La Liga", "Metropolitano", ["Atlético Madrid", "FC Barcelona"]),
+            make_event("evt-2", "Sevilla vs Valencia", "La Liga", "Sánchez-Pizjuán", ["Sevilla", "Valencia"]),
+        ]
+    )
+
+    assert search_ids(repo, query="atletico") == ["evt-1"]
+    assert search_ids(repo, query="Barca") == ["evt-1"]
+    assert search_ids(repo, filters=SearchFilters(team="atleti")) == ["evt-1"]
+    assert search_ids(repo, filters=SearchFilters(location="sanchez pizjuan")) == ["evt-2"]
+
+
+def test_trigram_index_finds_closest_token_above_threshold():
+    index = TrigramIndex()
+    index.add(["barcelona", "valencia", "yankees", "york"])
+
+    assert index.closest("barcelonna", 0.5) == "barcelona"
+    assert index.closest("yankes", 0.5) == "yankees"
+    assert index.closest("valhalla", 0.5) is None
+
+
+def test_inmemory_provider_corrects_misspellings_only_when_nothing_matches():
+    repo = InMemoryProviderRepository(
+        events=[
+            make_event("evt-1", "FC Barcelona vs Valencia", "La Liga", "Camp Nou", ["FC Barcelona", "Valencia"]),
+            make_event("evt-2", "Yankees vs Red Sox", "MLB", "Yankee Stadium", ["New York Yankees", "Boston Red Sox"]),
+        ]
+    )
+
+    assert search_ids(repo, query="Barcelonna") == ["evt-1"]
+    assert search_ids(repo, filters=SearchFilters(team="Yankes")) == ["evt-2"]
+    assert search_ids(repo, query="yankee") == ["evt-2"]
+    assert search_ids(repo, query="Valhalla") == []
+
+    for disabled in (None, 0):
+        strict = InMemoryProviderRepository(events=list(repo._events.values()), fuzzy_threshold=disabled)
+        assert search_ids(strict, query="Barcelonna") == []
+        assert search_ids(strict, query="Valhalla") == []
+
+
+def test_fuzzy_term_resolver_rejects_thresholds_outside_unit_interval():
+    for threshold in (0, -0.1, 1.5):
+        with pytest.raises(ValueError):
+            FuzzyTermResolver(threshold)
@@ -0,0 +1,509 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.append(str(SERVICE_ROOT))
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.repositories import (  # noqa: E402
+    CompositeProviderRepository,
+    HttpProviderConfig,
+    HttpProviderRepository,
+    ProviderQueryMapping,
+    ProviderRepository,
+    _ProviderPage,
+)
+from app.schemas import Event, ProviderHealth, ProviderStatus, SearchFilters, SearchRequest  # noqa: E402
+from common.jsonstream import JsonArrayStream  # noqa: E402
+from common.metrics import LatencyHistogram  # noqa: E402
+from common.resilience import (  # noqa: E402
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    HedgeBudget,
+    ProviderError,
+    RateLimitExceededError,
+    TokenBucketRateLimiter,
+)
+
+
+def make_event(event_id: str, title: str = "Stub Event") -> Event:
+    return Event(
+        event_id=event_id,
+        title=title,
+        league="Test",
+        venue="Test Venue",
+        start_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+        teams=["A", "B"],
+    )
+
+
+class StaticProvider(ProviderRepository):
+    def __init__(self, provider_id: str, events: List[Event], delay: float = 0.0, error: Exception | None = None) -> None:
+        self.provider_id = provider_id
+        self.events = events
+        self.delay = delay
+        self.error = error
+
+    async def search(self, request: SearchRequest) -> List[Event]:
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.events
+
+    async def status(self) -> List[ProviderStatus]:
+        return [ProviderStatus(provider_id=self.provider_id)]
+
+
+def test_composite_queries_providers_concurrently():
+    providers = [StaticProvider(f"p{idx}", [make_event(f"evt-{idx}")], delay=0.1) for idx in range(3)]
+    composite = CompositeProviderRepository(providers=providers, search_timeout_seconds=1.0)
+
+    started = time.perf_counter()
+    events = asyncio.run(composite.search(SearchRequest(query="Stub")))
+    elapsed = time.perf_counter() - started
+
+    assert [event.event_id for event in events] == ["evt-0", "evt-1", "evt-2"]
+    assert elapsed < 0.25
+
+
+def test_composite_merges_provider_results_by_start_time_and_dedupes():
+    def dated(event_id: str, day: int) -> Event:
+        return make_event(event_id).model_copy(update={"start_at": datetime(2024, 5, day, tzinfo=timezone.utc)})
+
+    providers = [
+        StaticProvider("p1", [dated("evt-a", 1), dated("evt-c", 3), dated("evt-e", 5)]),
+        StaticProvider("p2", [dated("evt-d", 4), dated("evt-b", 2), dated("evt-c", 3)]),
+    ]
+    composite = CompositeProviderRepository(providers=providers)
+
+    events = asyncio.run(composite.search(SearchRequest(query="Stub", limit=4)))
+
+    assert [event.event_id for event in events] == ["evt-a", "evt-b", "evt-c", "evt-d"]
+
+
+def test_composite_start_runs_provider_start_hooks():
+    class StartedProvider(StaticProvider):
+        started = False
+
+        async def start(self) -> None:
+            self.started = True
+
+    started = StartedProvider("started", [])
+    composite = CompositeProviderRepository(providers=[started, StaticProvider("plain", [])])
+
+    asyncio.run(composite.start())
+
+    assert started.started
+
+
+def test_composite_returns_partial_results_and_records_failures():
+    composite = CompositeProviderRepository(
+        providers=[
+            StaticProvider("fast", [make_event("evt-fast")]),
+            StaticProvider("slow", [make_event("evt-slow")], delay=1.0),
+            StaticProvider("broken", [], error=RuntimeError("upstream 500")),
+        ],
+        search_timeout_seconds=2.0,
+        provider_timeout_seconds=0.05,
+    )
+
+    events = asyncio.run(composite.search(SearchRequest(query="Stub")))
+    statuses = {status.provider_id: status for status in asyncio.run(composite.status())}
+
+    assert [event.event_id for event in events] == ["evt-fast"]
+    assert statuses["fast"].status == ProviderHealth.HEALTHY
+    assert statuses["slow"].status == ProviderHealth.DEGRADED
+    assert "timed out" in statuses["slow"].last_error
+    assert statuses["broken"].last_error == "upstream 500"
+
+
+def test_composite_status_reports_measured_latency_and_outcomes():
+    provider = StaticProvider("measured", [make_event("evt-1")], delay=0.02)
+    composite = CompositeProviderRepository(providers=[provider], provider_timeout_seconds=0.2)
+
+    async def scenario():
+        for _ in range(3):
+            await composite.search(SearchRequest(query="Stub"))
+        provider.delay = 0.5
+        with pytest.raises(ProviderError):
+            await composite.search(SearchRequest(query="Stub"))
+        provider.delay = 0.0
+        provider.error = RuntimeError("boom")
+        with pytest.raises(ProviderError, match="All 1 providers failed"):
+            await composite.search(SearchRequest(query="Stub"))
+        return (await composite.status())[0]
+
+    status = asyncio.run(scenario())
+
+    assert (status.success_count, status.timeout_count, status.error_count) == (3, 1, 1)
+    assert 20 <= status.latency_p50_ms <= 40
+    assert status.latency_p99_ms >= 200
+    assert status.latency_ms == round(status.latency_p50_ms)
+    assert status.status == ProviderHealth.DEGRADED
+
+
+def provider_payload(event_id: str) -> dict:
+    return {
+        "event_id": event_id,
+        "title": "Remote Event",
+        "league": "Remote League",
+        "start_at": "2024-05-01T18:00:00+00:00",
+        "teams": ["A", "B"],
+        "listings": [{"listing_id": f"list-{event_id}", "url": "https://tickets.example.com/x", "price": 40}],
+    }
+
+
+def test_http_provider_reuses_pooled_client_until_closed():
+    calls: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=[provider_payload("evt-remote")])
+
+    async def scenario():
+        client = httpx.AsyncClient(base_url="https://provider.test", transport=httpx.MockTransport(handler))
+        repo = HttpProviderRepository(
+            config=HttpProviderConfig(provider_id="remote", base_url="https://provider.test"),
+            client=client,
+        )
+
+        first = await repo.search(SearchRequest(query="Remote"))
+        second = await repo.search(SearchRequest(query="Remote"))
+        assert repo._get_client() is client
+
+        await repo.aclose()
+        return first, second, client
+
+    first, second, client = asyncio.run(scenario())
+
+    assert len(calls) == 2
+    assert first[0].event_id == second[0].event_id == "evt-remote"
+    assert client.is_closed
+
+
+def make_http_provider(handler, **config) -> HttpProviderRepository:
+    client = httpx.AsyncClient(base_url="https://provider.test", transport=httpx.MockTransport(handler))
+    return HttpProviderRepository(
+        config=HttpProviderConfig(
+            provider_id="remote",
+            base_url="https://provider.test",
+            retry_backoff_base_seconds=0.0,
+            **config,
+        ),
+        client=client,
+    )
+
+
+def test_http_provider_retries_transient_failures():
+    responses = iter([httpx.Response(503), httpx.Response(200, json=[provider_payload("evt-retry")])])
+    repo = make_http_provider(lambda request: next(responses), max_retries=2)
+
+    events = asyncio.run(repo.search(SearchRequest(query="Remote")))
+    status = asyncio.run(repo.status())[0]
+
+    assert [event.event_id for event in events] == ["evt-retry"]
+    assert status.status == ProviderHealth.HEALTHY
+
+
+def test_http_provider_circuit_opens_and_fails_fast():
+    calls: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(500)
+
+    repo = make_http_provider(handler, max_retries=1, circuit_failure_threshold=2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(repo.search(SearchRequest(query="Remote")))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(repo.search(SearchRequest(query="Remote")))
+
+    assert len(calls) == 2
+    assert asyncio.run(repo.status())[0].status == ProviderHealth.DOWN
+
+
+def test_circuit_breaker_half_open_probe_closes_on_success():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    now[0] = 10.0
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_http_provider_breaker_counts_bad_payloads_and_ignores_client_errors():
+    responses = iter([httpx.Response(500), httpx.Response(200, text="<html>oops</html>"), httpx.Response(404)])
+    repo = make_http_provider(lambda request: next(responses), max_retries=0, circuit_failure_threshold=3)
+
+    for _ in range(3):
+        with pytest.raises(Exception):
+            asyncio.run(repo.search(SearchRequest(query="Remote")))
+
+    # The garbage 200 is a failure; the 404 neither resets nor adds to the count.
+    assert repo._breaker.consecutive_failures == 2
+    assert repo._breaker.state == CircuitState.CLOSED
+
+
+def test_http_provider_client_error_probe_keeps_breaker_half_open():
+    now = [0.0]
+    repo = make_http_provider(lambda request: httpx.Response(404), circuit_failure_threshold=1)
+    repo._breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10, clock=lambda: now[0])
+    repo._breaker.record_failure()
+    now[0] = 10.0
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(repo.search(SearchRequest(query="Remote")))
+
+    assert repo._breaker.state == CircuitState.HALF_OPEN
+    assert repo._breaker.allow_request()
+
+
+def test_http_provider_hedges_slow_requests():
+    calls: List[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(1.0)
+            return httpx.Response(200, json=[provider_payload("evt-slow")])
+        return httpx.Response(200, json=[provider_payload("evt-hedge")])
+
+    repo = make_http_provider(handler, hedge_enabled=True, hedge_min_samples=5, hedge_budget_ratio=1.0)
+    for _ in range(5):
+        repo._latency.record(20.0)
+
+    started = time.perf_counter()
+    events = asyncio.run(repo.search(SearchRequest(query="Remote")))
+    elapsed = time.perf_counter() - started
+
+    assert [event.event_id for event in events] == ["evt-hedge"]
+    assert len(calls) == 2
+    assert elapsed < 0.5
+
+
+def test_http_provider_hedge_retrieves_loser_failure_finishing_with_winner():
+    calls: List[int] = []
+
+    async def fetch(params, request, limit) -> _ProviderPage:
+        calls.append(len(calls))
+        if len(calls) % 2:
+            await released.wait()
+            raise ProviderError("primary failed")
+        # Wakes the primary so both tasks finish before the hedging loop looks at them.
+        released.set()
+        return _ProviderPage(events=[], next_cursor=None)
+
+    repo = make_http_provider(
+        lambda request: httpx.Response(500), hedge_enabled=True, hedge_min_samples=5, hedge_budget_ratio=1.0
+    )
+    repo._fetch = fetch
+    for _ in range(5):
+        repo._latency.record(20.0)
+    unhandled: List[dict] = []
+
+    async def scenario():
+        nonlocal released
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        pages = []
+        # Which finished task the loop sees first is arbitrary, so hedge repeatedly.
+        for _ in range(20):
+            released = asyncio.Event()
+            pages.append(await repo._fetch_hedged({}, SearchRequest(query="Remote"), 10))
+            repo._hedge_budget.record_request()
+        gc.collect()
+        return pages
+
+    released = asyncio.Event()
+    pages = asyncio.run(scenario())
+
+    assert all(page.events == [] for page in pages)
+    assert len(calls) == 40
+    assert unhandled == []
+
+
+def test_hedge_budget_caps_extra_load():
+    budget = HedgeBudget(ratio=0.1)
+    granted = 0
+    for _ in range(100):
+        budget.record_request()
+        granted += budget.try_acquire()
+
+    assert granted == 10
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value in [10.0] * 90 + [500.0] * 10:
+        histogram.record(value)
+
+    assert histogram.count() == 100
+    assert 10.0 <= histogram.percentile(50) < 13.0
+    assert 500.0 <= histogram.percentile(99) < 640.0
+
+
+def test_json_array_stream_decodes_items_split_across_chunks():
+    body = json.dumps([{"id": 1, "name": "A"}, 23, "text", {"nested": [1, 2]}])
+
+    async def chunks():
+        for idx in range(0, len(body), 3):
+            yield body[idx : idx + 3]
+
+    async def collect():
+        return [item async for item in JsonArrayStream(chunks())]
+
+    assert asyncio.run(collect()) == [{"id": 1, "name": "A"}, 23, "text", {"nested": [1, 2]}]
+
+
+def test_http_provider_streaming_stops_reading_at_limit():
+    sent_chunks: List[int] = []
+    body = json.dumps([provider_payload(f"evt-{idx}") for idx in range(50)]).encode("utf-8")
+
+    async def stream_body():
+        for idx in range(0, len(body), 256):
+            sent_chunks.append(idx)
+            yield body[idx : idx + 256]
+
+    repo = make_http_provider(lambda request: httpx.Response(200, content=stream_body()), stream_events=True)
+
+    events = asyncio.run(repo.search(SearchRequest(query="Remote", limit=2)))
+
+    assert [event.event_id for event in events] == ["evt-0", "evt-1"]
+    assert len(sent_chunks) < len(body) // 256
+
+
+def test_http_provider_pushes_filters_down_and_follows_cursors():
+    seen_params: List[dict] = []
+    pages = {
+        None: {"data": [provider_payload("evt-1"), provider_payload("evt-2")], "next": "page-2"},
+        "page-2": {"data": [provider_payload("evt-3"), provider_payload("evt-4")], "next": "page-3"},
+        "page-3": {"data": [provider_payload("evt-5")], "next": None},
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        seen_params.append(params)
+        return httpx.Response(200, json=pages[params.get("page_token")])
+
+    mapping = ProviderQueryMapping(
+        query_param="keyword",
+        team_param="team_name",
+        cursor_param="page_token",
+        items_field="data",
+        next_cursor_field="next",
+    )
+    request = SearchRequest(
+        query="Remote",
+        filters=SearchFilters(team="A", date_from=datetime(2024, 1, 1, tzinfo=timezone.utc)),
+        limit=3,
+    )
+
+    for stream_events in (False, True):
+        seen_params.clear()
+        repo = make_http_provider(handler, query_mapping=mapping, stream_events=stream_events)
+        events = asyncio.run(repo.search(request))
+
+        assert [event.event_id for event in events] == ["evt-1", "evt-2", "evt-3"]
+        assert len(seen_params) == 2
+        assert seen_params[0] == {
+            "keyword": "Remote",
+            "team_name": "A",
+            "date_from": "2024-01-01T00:00:00+00:00",
+            "limit": "3",
+        }
+        assert seen_params[1]["page_token"] == "page-2"
+        assert seen_params[1]["limit"] == "1"
+
+
+def test_token_bucket_queues_then_rejects_when_full():
+    async def scenario():
+        limiter = TokenBucketRateLimiter(rate_per_second=20, burst=1, max_queue=1, max_wait_seconds=1.0)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.saturated
+        with pytest.raises(RateLimitExceededError):
+            await limiter.acquire()
+        await waiter
+        return limiter
+
+    limiter = asyncio.run(scenario())
+
+    assert limiter.rejected == 1
+    assert limiter.waiting == 0
+
+
+def test_rate_limited_provider_is_skipped_and_reported():
+    repo = make_http_provider(
+        lambda request: httpx.Response(200, json=[provider_payload("evt-1")]),
+        rate_limit_per_second=0.5,
+        rate_limit_burst=1,
+        rate_limit_max_wait_seconds=0.1,
+    )
+    composite = CompositeProviderRepository(providers=[repo, StaticProvider("local", [make_event("evt-local")])])
+
+    async def scenario():
+        first = await composite.search(SearchRequest(query="Remote"))
+        second = await composite.search(SearchRequest(query="Stub"))
+        return first, second, await composite.status()
+
+    first, second, statuses = asyncio.run(scenario())
+
+    assert sorted(event.event_id for event in first) == ["evt-1", "evt-local"]
+    assert [event.event_id for event in second] == ["evt-local"]
+    remote = statuses[0]
+    assert remote.status == ProviderHealth.DEGRADED
+    assert remote.rate_limit.rejected_total == 1
+    assert "Rate limit exceeded" in remote.last_error
+
+
+def test_open_circuit_fails_fast_without_spending_rate_limit_tokens():
+    repo = make_http_provider(
+        lambda request: httpx.Response(500),
+        max_retries=0,
+        circuit_failure_threshold=1,
+        rate_limit_per_second=0.01,
+        rate_limit_burst=2,
+        rate_limit_max_wait_seconds=0.1,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(repo.search(SearchRequest(query="Remote")))
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(repo.search(SearchRequest(query="Remote")))
+
+    assert repo._rate_limiter.tokens_available == pytest.approx(1.0, abs=0.01)
+
+
+def test_refused_hedge_keeps_rate_limit_token():
+    repo = make_http_provider(
+        lambda request: httpx.Response(200, json=[]),
+        hedge_budget_ratio=0.1,
+        rate_limit_per_second=0.01,
+        rate_limit_burst=5,
+    )
+
+    assert not any(repo._can_hedge() for _ in range(3))
+    assert repo._rate_limiter.tokens_available == pytest.approx(5.0, abs=0.01)
@@ -2,18 +2,34 @@ from __future__ import annotations
 
 import sys
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Sequence, Set
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
 if str(SERVICE_ROOT) not in sys.path:
     sys.path.append(str(SERVICE_ROOT))
 
-from app.repositories import InMemorySearchCache, ProviderRepository
-from app.schemas import Currency, Event, Price, SearchRequest, SeatDetails, TicketListing
-from app.services import SearchService
+from app.repositories import (
+    CacheFreshness,
+    CompositeProviderRepository,
+    InMemorySearchCache,
+    InMemoryUserProfileRepository,
+    ProviderRepository,
+)
+from app.schemas import (
+    Currency,
+    Event,
+    Favorite,
+    FavoriteType,
+    Price,
+    SearchFilters,
+    SearchRequest,
+    SeatDetails,
+    TicketListing,
+)
+from app.services import CacheWarmer, SearchService
 from common.normalization import dedupe_events, sort_events
 
 
@@ -63,6 +79,152 @@ def test_search_service_caches_results():
     assert provider.calls == 1
 
 
+def test_search_service_shares_cache_entries_for_equivalent_queries():
+    provider = CountingProvider()
+    service = SearchService(provider_repository=provider, cache_repository=InMemorySearchCache(ttl_seconds=10))
+
+    asyncio.run(service.search(SearchRequest(query="Atlético Madrid")))
+    asyncio.run(service.search(SearchRequest(query="  atletico   MADRID!")))
+
+    assert provider.calls == 1
+
+
+def test_search_cache_key_is_canonical_across_case_and_timezone_offsets():
+    start = datetime(2025, 3, 1, 18, tzinfo=timezone.utc)
+    shifted = start.astimezone(timezone(timedelta(hours=-5)))
+
+    base = SearchService._cache_key(
+        SearchRequest(query="Barcelona", filters=SearchFilters(date_from=start, date_to=start + timedelta(days=1)))
+    )
+    variant = SearchService._cache_key(
+        SearchRequest(query=" BARCELONA ", filters=SearchFilters(date_from=shifted, date_to=shifted + timedelta(days=1)))
+    )
+
+    assert variant == base
+
+
+class PagedProvider(CountingProvider):
+    def __init__(self, total: int) -> None:
+        super().__init__()
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.events = [
+            self.events[0].model_copy(update={"event_id": f"evt-{idx:03d}", "start_at": start + timedelta(hours=idx)})
+            for idx in range(total)
+        ]
+        self.limits: List[int] = []
+
+    async def search(self, request: SearchRequest) -> List[Event]:
+        self.calls += 1
+        self.limits.append(request.limit)
+        return self.events[: request.limit]
+
+
+def test_search_service_serves_smaller_limits_from_cached_superset():
+    provider = PagedProvider(total=40)
+    service = SearchService(provider_repository=provider, cache_repository=InMemorySearchCache(ttl_seconds=10))
+
+    async def run():
+        first = await service.search(SearchRequest(query="Stub", limit=25))
+        smaller = await service.search(SearchRequest(query="Stub", limit=10))
+        larger = await service.search(SearchRequest(query="Stub", limit=50))
+        after = [await service.search(SearchRequest(query="Stub", limit=limit)) for limit in (5, 25, 100)]
+        return first, smaller, larger, after
+
+    first, smaller, larger, after = asyncio.run(run())
+
+    assert (first.total, smaller.total, larger.total) == (25, 10, 40)
+    assert [event.event_id for event in smaller.results] == [event.event_id for event in first.results[:10]]
+    # limit=50 returned only 40 events, so the cached set is complete and even limit=100 is a hit.
+    assert [result.total for result in after] == [5, 25, 40]
+    assert provider.limits == [25, 50]
+
+
+class SlowProvider(CountingProvider):
+    def __init__(self, error: Exception | None = None) -> None:
+        super().__init__()
+        self.error = error
+
+    async def search(self, request: SearchRequest) -> List[Event]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        return self.events
+
+
+def test_search_service_coalesces_concurrent_misses():
+    provider = SlowProvider()
+    service = SearchService(provider_repository=provider, cache_repository=InMemorySearchCache(ttl_seconds=10))
+
+    async def run():
+        return await asyncio.gather(*(service.search(SearchRequest(query="Stub")) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert provider.calls == 1
+    assert all(result.total == 1 for result in results)
+    assert len(service._flights) == 0
+
+
+def test_search_service_propagates_coalesced_errors_to_every_waiter():
+    provider = SlowProvider(error=RuntimeError("provider down"))
+    service = SearchService(provider_repository=provider, cache_repository=None)
+
+    async def run():
+        return await asyncio.gather(
+            *(service.search(SearchRequest(query="Stub")) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert provider.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    # The failed flight is forgotten, so the next search retries the provider.
+    provider.error = None
+    assert asyncio.run(service.search(SearchRequest(query="Stub"))).total == 1
+    assert provider.calls == 2
+
+
+def test_search_service_serves_stale_results_while_one_refresh_runs():
+    now = [1000.0]
+    provider = SlowProvider()
+    cache = InMemorySearchCache(ttl_seconds=10, stale_while_revalidate_seconds=30, clock=lambda: now[0])
+    service = SearchService(provider_repository=provider, cache_repository=cache)
+
+    async def run():
+        await service.search(SearchRequest(query="Stub"))
+        now[0] += 20
+        stale = await asyncio.gather(*(service.search(SearchRequest(query="Stub")) for _ in range(3)))
+        await asyncio.sleep(0.05)
+        return stale, await cache.lookup(service._cache_key(SearchRequest(query="Stub")))
+
+    stale, refreshed = asyncio.run(run())
+
+    assert all(result.total == 1 for result in stale)
+    assert provider.calls == 2
+    assert refreshed.freshness is CacheFreshness.FRESH
+
+
+def test_search_service_serves_stale_results_when_providers_fail():
+    now = [1000.0]
+    provider = CountingProvider()
+    cache = InMemorySearchCache(ttl_seconds=10, stale_if_error_seconds=60, clock=lambda: now[0])
+    composite = CompositeProviderRepository(providers=[provider])
+    service = SearchService(provider_repository=composite, cache_repository=cache)
+
+    asyncio.run(service.search(SearchRequest(query="Stub")))
+    now[0] += 30
+    provider.search = failing_search
+
+    assert asyncio.run(service.search(SearchRequest(query="Stub"))).total == 1
+    assert asyncio.run(service.search(SearchRequest(query="Other"))).total == 0
+
+
+async def failing_search(request: SearchRequest) -> List[Event]:
+    raise RuntimeError("provider down")
+
+
 def test_best_price_marking():
     provider = CountingProvider()
     provider.events[0].listings = [
@@ -172,3 +334,71 @@ def test_normalization_dedupes_and_sorts():
 
     # ensure dedup kept only one listing set (first occurrence)
     assert len(events[1].listings) == 1
+
+
+class PopularQueryCache(InMemorySearchCache):
+    """Stands in for a Mongo-backed cache: ranked popular requests and keys still fresh in L2."""
+
+    def __init__(self, popular: List[SearchRequest], fresh_in_l2: Iterable[str] = ()) -> None:
+        super().__init__(ttl_seconds=60)
+        self.popular = popular
+        self.fresh_in_l2 = set(fresh_in_l2)
+
+    async def popular_requests(self, limit: int) -> List[SearchRequest]:
+        return self.popular[:limit]
+
+    async def expiring_keys(self, keys: Sequence[str], within_seconds: float) -> Set[str]:
+        return set(keys) - self.fresh_in_l2
+
+
+def test_cache_warmer_refreshes_popular_queries_and_favorites_not_fresh_in_l2():
+    provider = PagedProvider(total=40)
+    fresh = SearchRequest(query="Fresh")
+    cache = PopularQueryCache(
+        [SearchRequest(query="Stub", limit=10), SearchRequest(query=" STUB ", limit=30), fresh],
+        fresh_in_l2=[SearchService._cache_key(fresh)],
+    )
+    service = SearchService(provider_repository=provider, cache_repository=cache)
+    profiles = InMemoryUserProfileRepository()
+    for user_id, name in (("user-1", "Lakers"), ("user-2", "Lakers"), ("user-3", "Celtics")):
+        asyncio.run(profiles.upsert_favorite(user_id, Favorite(type=FavoriteType.TEAM, name=name)))
+    asyncio.run(profiles.upsert_favorite("user-3", Favorite(type=FavoriteType.LEAGUE, name="NBA")))
+    warmer = CacheWarmer(search_service=service, favorites_repository=profiles, top_favorites=2)
+
+    async def run():
+        warmed = await warmer.run()
+        calls = provider.calls
+        await service.search(SearchRequest(query="stub", limit=25))
+        await service.search(SearchRequest(filters=SearchFilters(team="lakers")))
+        await cache.aclose()
+        return warmed, calls
+
+    warmed, calls = asyncio.run(run())
+
+    # Equivalent queries warm one entry at the largest limit; only the top 2 favorites count,
+    # and the query still fresh in the shared cache is not re-fetched.
+    assert warmed == 3
+    assert sorted(provider.limits) == [25, 25, 30]
+    assert warmer.ready
+    assert provider.calls == calls == 3
+
+
+def test_cache_warmer_has_nothing_to_warm_with_default_in_memory_stores():
+    provider = PagedProvider(total=5)
+    service = SearchService(provider_repository=provider, cache_repository=InMemorySearchCache(ttl_seconds=60))
+    warmer = CacheWarmer(search_service=service, favorites_repository=InMemoryUserProfileRepository())
+
+    assert asyncio.run(warmer.run()) == 0
+    assert warmer.ready
+    assert provider.calls == 0
+
+
+def test_cache_warmer_reports_ready_after_timeout():
+    provider = SlowProvider()
+    cache = PopularQueryCache([SearchRequest(query="Stub")])
+    warmer = CacheWarmer(
+        search_service=SearchService(provider_repository=provider, cache_repository=cache), timeout_seconds=0.001
+    )
+
+    assert asyncio.run(warmer.run()) == 0
+    assert warmer.ready
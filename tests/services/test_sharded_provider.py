@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SERVICE_ROOT = PROJECT_ROOT / "src" / "backend" / "services" / "api-service"
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.append(str(SERVICE_ROOT))
+
+from app.repositories import InMemoryProviderRepository  # noqa: E402
+from app.repositories_sharded import ShardedProviderRepository  # noqa: E402
+from app.schemas import Event, SearchFilters, SearchRequest  # noqa: E402
+
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def make_event(event_id: str, title: str, teams: list[str], hours: int) -> Event:
+    return Event(event_id=event_id, title=title, start_at=START + timedelta(hours=hours), teams=teams)
+
+
+def test_sharded_provider_matches_single_process_results(make_catalog):
+    cases = [
+        (
+            make_catalog(60, START),
+            [
+                SearchRequest(query="madrid", limit=7),
+                SearchRequest(filters=SearchFilters(team="celtics", date_from=START + timedelta(hours=50))),
+                SearchRequest(query="Barcelonna", limit=3),
+                SearchRequest(query="valhalla"),
+            ],
+        ),
+        (
+            # Round-robin puts each event in its own shard; only the whole catalog picks "barcelona".
+            [
+                make_event("evt-0", "Barcelona vs Sevilla", ["Barcelona", "Sevilla"], 1),
+                make_event("evt-1", "Barcelos vs Braga", ["Barcelos", "Braga"], 2),
+            ],
+            [SearchRequest(query="Barcelonna")],
+        ),
+    ]
+
+    async def scenario(events, requests):
+        sharded = ShardedProviderRepository(events, shards=2)
+        try:
+            await sharded.start()
+            return [await sharded.search(request) for request in requests]
+        finally:
+            await sharded.aclose()
+
+    for events, requests in cases:
+        single = InMemoryProviderRepository(events=events)
+        results = asyncio.run(scenario(events, requests))
+
+        for request, found in zip(requests, results):
+            expected = sorted(single.find(request), key=lambda event: (event.start_at, event.title))
+            assert [event.event_id for event in found] == [event.event_id for event in expected]